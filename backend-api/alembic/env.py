@@ -4,6 +4,7 @@ Alembic environment configuration.
 from logging.config import fileConfig
 from sqlalchemy import engine_from_config
 from sqlalchemy import pool
+from sqlalchemy.engine import make_url
 from alembic import context
 import os
 import sys
@@ -13,13 +14,20 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.config import settings
 from app.database import Base
-from app.models import User, Reminder, CallLog  # noqa
+from app.models import User, Reminder, CallLog, ReminderStatusCount  # noqa
 
 # this is the Alembic Config object
 config = context.config
 
-# Override sqlalchemy.url with environment variable
-config.set_main_option("sqlalchemy.url", settings.DATABASE_URL)
+# Override sqlalchemy.url with environment variable; migrations run on the
+# sync psycopg driver whatever driver the URL names (the app uses asyncpg)
+config.set_main_option(
+    "sqlalchemy.url",
+    make_url(settings.DATABASE_URL)
+    .set(drivername="postgresql+psycopg")
+    .render_as_string(hide_password=False)
+    .replace("%", "%%")
+)
 
 # Interpret the config file for Python logging
 if config.config_file_name is not None:
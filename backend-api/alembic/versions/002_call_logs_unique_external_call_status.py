@@ -0,0 +1,44 @@
+"""Enforce call log idempotency with a unique (external_call_id, status) constraint
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '002'
+down_revision: Union[str, None] = '001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Failed dispatches used to share a placeholder call id; make them unique per reminder
+    op.execute(
+        "UPDATE call_logs SET external_call_id = 'failed-to-create-' || reminder_id "
+        "WHERE external_call_id = 'failed-to-create'"
+    )
+    
+    # Drop duplicate webhook deliveries, keeping the first one received
+    op.execute(
+        """
+        DELETE FROM call_logs a
+        USING call_logs b
+        WHERE a.external_call_id = b.external_call_id
+          AND a.status = b.status
+          AND (a.received_at, a.id) > (b.received_at, b.id)
+        """
+    )
+    
+    op.drop_index('ix_call_logs_external_call_id_status', table_name='call_logs')
+    op.create_unique_constraint(
+        'uq_call_logs_ecid_status', 'call_logs', ['external_call_id', 'status']
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_call_logs_ecid_status', 'call_logs', type_='unique')
+    op.create_index('ix_call_logs_external_call_id_status', 'call_logs', ['external_call_id', 'status'])
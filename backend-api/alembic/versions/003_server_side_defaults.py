@@ -0,0 +1,40 @@
+"""Generate ids and timestamps with server-side defaults
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '003'
+down_revision: Union[str, None] = '002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Timestamps are stored as naive UTC, independent of the session time zone
+UTC_NOW = sa.text("timezone('utc', now())")
+
+# gen_random_uuid() is built in from PostgreSQL 13; no pgcrypto needed
+TIMESTAMP_COLUMNS = {
+    'users': ['created_at', 'updated_at'],
+    'reminders': ['created_at', 'updated_at'],
+    'call_logs': ['received_at'],
+}
+
+
+def upgrade() -> None:
+    for table, columns in TIMESTAMP_COLUMNS.items():
+        op.alter_column(table, 'id', server_default=sa.text('gen_random_uuid()'))
+        for column in columns:
+            op.alter_column(table, column, server_default=UTC_NOW)
+
+
+def downgrade() -> None:
+    for table, columns in TIMESTAMP_COLUMNS.items():
+        op.alter_column(table, 'id', server_default=None)
+        for column in columns:
+            op.alter_column(table, column, server_default=sa.func.now())
@@ -0,0 +1,110 @@
+"""Add trigger-maintained per-user reminder status counters
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '004'
+down_revision: Union[str, None] = '003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'reminder_status_counts',
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('scheduled', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('processing', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('called', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('failed', sa.Integer(), nullable=False, server_default='0'),
+    )
+    
+    # Apply a +1/-1 delta to one status column of a user's counter row.
+    # Decrements only UPDATE: when a user is deleted the cascade may remove the
+    # counter row before the reminders, and re-inserting it would break the FK.
+    op.execute(
+        """
+        CREATE FUNCTION reminder_status_counts_apply(uid uuid, s reminder_status, delta integer)
+        RETURNS void LANGUAGE plpgsql AS $$
+        BEGIN
+            IF delta > 0 THEN
+                INSERT INTO reminder_status_counts AS c (user_id, scheduled, processing, called, failed)
+                VALUES (
+                    uid,
+                    (s = 'scheduled')::int * delta,
+                    (s = 'processing')::int * delta,
+                    (s = 'called')::int * delta,
+                    (s = 'failed')::int * delta
+                )
+                ON CONFLICT (user_id) DO UPDATE SET
+                    scheduled = c.scheduled + EXCLUDED.scheduled,
+                    processing = c.processing + EXCLUDED.processing,
+                    called = c.called + EXCLUDED.called,
+                    failed = c.failed + EXCLUDED.failed;
+            ELSE
+                UPDATE reminder_status_counts SET
+                    scheduled = scheduled + (s = 'scheduled')::int * delta,
+                    processing = processing + (s = 'processing')::int * delta,
+                    called = called + (s = 'called')::int * delta,
+                    failed = failed + (s = 'failed')::int * delta
+                WHERE user_id = uid;
+            END IF;
+        END;
+        $$;
+        """
+    )
+    op.execute(
+        """
+        CREATE FUNCTION reminders_maintain_status_counts()
+        RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                PERFORM reminder_status_counts_apply(NEW.user_id, NEW.status, 1);
+            ELSIF TG_OP = 'DELETE' THEN
+                PERFORM reminder_status_counts_apply(OLD.user_id, OLD.status, -1);
+            ELSIF NEW.status IS DISTINCT FROM OLD.status OR NEW.user_id IS DISTINCT FROM OLD.user_id THEN
+                PERFORM reminder_status_counts_apply(OLD.user_id, OLD.status, -1);
+                PERFORM reminder_status_counts_apply(NEW.user_id, NEW.status, 1);
+            END IF;
+            RETURN NULL;
+        END;
+        $$;
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER reminders_status_counts
+        AFTER INSERT OR UPDATE OF status, user_id OR DELETE ON reminders
+        FOR EACH ROW EXECUTE FUNCTION reminders_maintain_status_counts();
+        """
+    )
+    
+    # Backfill from existing reminders
+    op.execute(
+        """
+        INSERT INTO reminder_status_counts (user_id, scheduled, processing, called, failed)
+        SELECT
+            user_id,
+            count(*) FILTER (WHERE status = 'scheduled'),
+            count(*) FILTER (WHERE status = 'processing'),
+            count(*) FILTER (WHERE status = 'called'),
+            count(*) FILTER (WHERE status = 'failed')
+        FROM reminders
+        GROUP BY user_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER reminders_status_counts ON reminders")
+    op.execute("DROP FUNCTION reminders_maintain_status_counts()")
+    op.execute("DROP FUNCTION reminder_status_counts_apply(uuid, reminder_status, integer)")
+    op.drop_table('reminder_status_counts')
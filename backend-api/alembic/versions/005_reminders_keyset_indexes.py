@@ -0,0 +1,38 @@
+"""Add (scheduled_at, id) indexes for keyset pagination of reminders
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '005'
+down_revision: Union[str, None] = '004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Both replace an index that is a prefix of the new one
+    op.create_index(
+        'ix_reminders_scheduled_at_id', 'reminders',
+        [sa.text('scheduled_at DESC'), sa.text('id DESC')]
+    )
+    op.drop_index('ix_reminders_scheduled_at', table_name='reminders')
+    
+    op.create_index(
+        'ix_reminders_user_id_scheduled_at_id', 'reminders',
+        ['user_id', sa.text('scheduled_at DESC'), sa.text('id DESC')]
+    )
+    op.drop_index('ix_reminders_user_id', table_name='reminders')
+
+
+def downgrade() -> None:
+    op.create_index('ix_reminders_user_id', 'reminders', ['user_id'])
+    op.drop_index('ix_reminders_user_id_scheduled_at_id', table_name='reminders')
+    op.create_index('ix_reminders_scheduled_at', 'reminders', ['scheduled_at'])
+    op.drop_index('ix_reminders_scheduled_at_id', table_name='reminders')
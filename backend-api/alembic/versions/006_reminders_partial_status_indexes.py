@@ -0,0 +1,45 @@
+"""Replace the (status, scheduled_at) index with partial indexes on live statuses
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '006'
+down_revision: Union[str, None] = '005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction block; build without
+    # blocking the scheduler's writes to reminders
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_reminders_due', 'reminders', ['scheduled_at'],
+            postgresql_where=sa.text("status = 'scheduled'"),
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+        op.create_index(
+            'ix_reminders_processing', 'reminders', ['scheduled_at'],
+            postgresql_where=sa.text("status = 'processing'"),
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+        op.drop_index(
+            'ix_reminders_status_scheduled_at', table_name='reminders',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
+
+
+def downgrade() -> None:
+    op.create_index('ix_reminders_status_scheduled_at', 'reminders', ['status', 'scheduled_at'])
+    op.drop_index('ix_reminders_processing', table_name='reminders')
+    op.drop_index('ix_reminders_due', table_name='reminders')
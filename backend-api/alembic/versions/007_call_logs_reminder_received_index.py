@@ -0,0 +1,36 @@
+"""Index call_logs on (reminder_id, received_at)
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '007'
+down_revision: Union[str, None] = '006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The composite index also serves reminder_id-only lookups, so it
+    # replaces the single-column one
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_call_logs_reminder_received', 'call_logs', ['reminder_id', 'received_at'],
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+        op.drop_index(
+            'ix_call_logs_reminder_id', table_name='call_logs',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
+
+
+def downgrade() -> None:
+    op.create_index('ix_call_logs_reminder_id', 'call_logs', ['reminder_id'])
+    op.drop_index('ix_call_logs_reminder_received', table_name='call_logs')
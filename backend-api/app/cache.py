@@ -0,0 +1,156 @@
+"""
+Redis-backed response cache.
+
+Caching is optional: without REDIS_URL every helper here is a pass-through,
+and Redis errors are logged and treated as cache misses so the API keeps
+serving from the database.
+"""
+import functools
+import logging
+from typing import Any, Awaitable, Callable
+
+import orjson
+from fastapi.responses import Response
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.config import settings
+from app.http_cache import body_etag, not_modified
+
+logger = logging.getLogger(__name__)
+
+# Cache keys
+STATS_CACHE_KEY = "reminder:stats"
+NOTIFICATIONS_CACHE_KEY = "notifications:recent:{since_seconds}"
+NOTIFICATIONS_CACHE_PATTERN = "notifications:recent:*"
+
+
+def notifications_cache_ttl(since_seconds: int, **_: Any) -> int:
+    """
+    TTL for a cached notifications window.
+
+    A response must not outlive the window it covers, or updates made between
+    cache fills never reach short-window pollers; half the window, capped at
+    NOTIFICATIONS_CACHE_TTL_SECONDS, with a 1s floor.
+    """
+    return min(settings.NOTIFICATIONS_CACHE_TTL_SECONDS, max(1, since_seconds // 2))
+
+redis_client: Redis | None = (
+    Redis.from_url(settings.REDIS_URL) if settings.REDIS_URL else None
+)
+
+
+async def get_cached(key: str) -> bytes | None:
+    """
+    Read a cached value.
+
+    Args:
+        key: Cache key
+
+    Returns:
+        Cached bytes, or None on a miss, when caching is disabled or on error
+    """
+    if redis_client is None:
+        return None
+    try:
+        return await redis_client.get(key)
+    except RedisError as e:
+        logger.warning("Cache read failed for %s: %s", key, e)
+        return None
+
+
+async def set_cached(key: str, value: bytes, ttl: int) -> None:
+    """
+    Store a value with an expiry.
+
+    Args:
+        key: Cache key
+        value: Serialized value
+        ttl: Time to live in seconds
+    """
+    if redis_client is None:
+        return
+    try:
+        await redis_client.set(key, value, ex=ttl)
+    except RedisError as e:
+        logger.warning("Cache write failed for %s: %s", key, e)
+
+
+async def invalidate(*keys: str) -> None:
+    """
+    Drop cached values after a write that makes them stale.
+
+    Args:
+        keys: Cache keys to delete
+    """
+    if redis_client is None:
+        return
+    try:
+        await redis_client.delete(*keys)
+    except RedisError as e:
+        logger.warning("Cache invalidation failed for %s: %s", keys, e)
+
+
+async def invalidate_pattern(pattern: str) -> None:
+    """
+    Drop every cached value whose key matches a glob pattern.
+
+    Args:
+        pattern: Redis glob pattern, e.g. "notifications:recent:*"
+    """
+    if redis_client is None:
+        return
+    try:
+        keys = [key async for key in redis_client.scan_iter(match=pattern)]
+        if keys:
+            await redis_client.unlink(*keys)
+    except RedisError as e:
+        logger.warning("Cache invalidation failed for %s: %s", pattern, e)
+
+
+def cached(key: str, ttl: int | Callable[..., int], conditional: bool = False) -> Callable:
+    """
+    Cache a JSON endpoint's result in Redis.
+
+    The key may contain str.format placeholders naming endpoint parameters,
+    e.g. "notifications:recent:{since_seconds}", to cache per argument value.
+    Likewise ttl may be a callable, called with the endpoint's keyword
+    arguments, for a TTL that depends on them.
+
+    On a hit the stored bytes are returned directly as the response body; on a
+    miss the endpoint runs and its result is orjson-encoded once, both for the
+    cache and as the response body, bypassing FastAPI's jsonable_encoder.
+
+    With conditional=True the body's digest is sent as an ETag and a matching
+    If-None-Match gets a bodiless 304; the endpoint must then take a
+    `request: Request` parameter.
+
+    Args:
+        key: Cache key or key template
+        ttl: Time to live in seconds, or a callable returning it
+        conditional: Honor If-None-Match with an ETag derived from the body
+
+    Returns:
+        Decorator for an async FastAPI endpoint returning JSON-serializable data
+    """
+    def decorator(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            cache_key = key.format(**kwargs)
+            body = await get_cached(cache_key)
+            if body is None:
+                body = orjson.dumps(await func(*args, **kwargs))
+                await set_cached(cache_key, body, ttl(**kwargs) if callable(ttl) else ttl)
+
+            response = Response(content=body, media_type="application/json")
+            if conditional:
+                return not_modified(kwargs["request"], response, body_etag(body)) or response
+            return response
+        return wrapper
+    return decorator
+
+
+async def close() -> None:
+    """Close the Redis connection pool on shutdown."""
+    if redis_client is not None:
+        await redis_client.aclose()
@@ -19,28 +19,59 @@ class Settings(BaseSettings):
     # Credentials must be provided in .env file
     DATABASE_URL: str
     
+    # Connection pool - size as (max Postgres connections / uvicorn workers)
+    POOL_SIZE: int = 20
+    POOL_OVERFLOW: int = 40
+    POOL_TIMEOUT: int = 30
+    POOL_RECYCLE_SECONDS: int = 3600
+    
+    # Set when connecting through PgBouncer in transaction pooling mode, which
+    # cannot keep asyncpg's server-side prepared statements across transactions
+    PGBOUNCER: bool = False
+    
+    # Compiled-statement cache (SQLAlchemy default is 500 entries)
+    QUERY_CACHE_SIZE: int = 1200
+    
+    # In-process cache of user lookups (per worker process)
+    USER_CACHE_SIZE: int = 10_000
+    USER_CACHE_TTL_SECONDS: int = 60
+    
+    # Redis response cache - disabled when unset
+    REDIS_URL: str | None = None
+    STATS_CACHE_TTL_SECONDS: int = 10
+    NOTIFICATIONS_CACHE_TTL_SECONDS: int = 3
+    
+    # Worker service base URL, woken when a reminder is created - disabled when unset
+    WORKER_URL: str | None = None
+    
     # Allow all for debugging - accept string from .env
-    CORS_ORIGINS: Union[str, list[str]] = "*"
+    # Parsed once into an immutable tuple that middleware can reuse as-is
+    CORS_ORIGINS: Union[str, tuple[str, ...]] = ("*",)
 
     @field_validator("CORS_ORIGINS", mode="before")
     @classmethod
     def parse_cors_origins(cls, v):
         if isinstance(v, str):
             # Handle comma-separated string from .env
-            origins = [origin.strip() for origin in v.split(",") if origin.strip()]
-            return origins if origins else ["*"]
-        return v if isinstance(v, list) else ["*"]
+            origins = tuple(origin.strip() for origin in v.split(",") if origin.strip())
+            return origins or ("*",)
+        return tuple(v) if isinstance(v, (list, tuple)) else ("*",)
+    
+    # Browser clients send no cookies/auth headers cross-origin; enable only if they do
+    CORS_ALLOW_CREDENTIALS: bool = False
     
     # Logging
     LOG_LEVEL: str = "INFO"
     
-    class Config:
-        env_file = "../.env"
-        env_file_encoding = "utf-8"
-        extra = "ignore"
+    model_config = SettingsConfigDict(
+        env_file="../.env",
+        env_file_encoding="utf-8",
+        extra="ignore",
+        frozen=True
+    )
 
 
-@lru_cache()
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
     """Get cached settings instance."""
     return Settings()
@@ -1,40 +1,58 @@
 """
 Database connection and session management.
-Uses SQLAlchemy async engine with PostgreSQL.
+Uses SQLAlchemy async engine with PostgreSQL (asyncpg driver).
 """
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from typing import AsyncGenerator
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.orm import declarative_base
 from app.config import settings
 
-# Create SQLAlchemy engine
-engine = create_engine(
-    settings.DATABASE_URL,
+# DATABASE_URL is shared with Alembic (sync psycopg); the app always talks asyncpg
+ASYNC_DATABASE_URL = make_url(settings.DATABASE_URL).set(drivername="postgresql+asyncpg")
+
+# PgBouncer (transaction mode) cannot keep prepared statements across
+# transactions, so turn off both asyncpg's and SQLAlchemy's statement caches
+CONNECT_ARGS = (
+    {"statement_cache_size": 0, "prepared_statement_cache_size": 0}
+    if settings.PGBOUNCER else {}
+)
+
+# Create SQLAlchemy async engine
+engine = create_async_engine(
+    ASYNC_DATABASE_URL,
     pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
+    pool_size=settings.POOL_SIZE,
+    max_overflow=settings.POOL_OVERFLOW,
+    pool_timeout=settings.POOL_TIMEOUT,
+    pool_recycle=settings.POOL_RECYCLE_SECONDS,
+    query_cache_size=settings.QUERY_CACHE_SIZE,
+    connect_args=CONNECT_ARGS,
     echo=settings.DEBUG
 )
 
 # Session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = async_sessionmaker(
+    bind=engine,
+    autoflush=False,
+    expire_on_commit=False
+)
 
 # Base class for models
 Base = declarative_base()
 
 
-def get_db():
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
     Dependency that provides database session.
     Automatically closes session after request.
     """
-    db = SessionLocal()
-    try:
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 
-def init_db():
-    """Initialize database tables."""
-    from app.models import user, reminder, call_log  # noqa
-    Base.metadata.create_all(bind=engine)
+async def init_db():
+    """Create any missing tables (development only - production uses Alembic)."""
+    from app.models import user, reminder, call_log, reminder_status_count  # noqa
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
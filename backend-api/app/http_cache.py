@@ -0,0 +1,71 @@
+"""
+HTTP conditional-request helpers (ETag / If-None-Match) for single-entity GETs.
+"""
+import hashlib
+
+from fastapi import Request, Response, status
+
+# Browsers may reuse a response briefly without revalidating; after that they
+# revalidate with If-None-Match and get a bodiless 304 while unchanged
+CACHE_CONTROL = "private, max-age=2"
+
+
+def weak_etag(*parts) -> str:
+    """
+    Build a weak ETag from values that change whenever the entity does.
+
+    Args:
+        parts: Version components, e.g. updated_at timestamp
+
+    Returns:
+        ETag header value such as W/"1760563200.123456"
+    """
+    return 'W/"' + "-".join(str(part) for part in parts) + '"'
+
+
+def body_etag(body: bytes) -> str:
+    """
+    Build a weak ETag from a response body, for payloads with no version column.
+
+    Args:
+        body: Serialized response body
+
+    Returns:
+        ETag header value holding a 64-bit BLAKE2b digest of the body
+    """
+    return weak_etag(hashlib.blake2b(body, digest_size=8).hexdigest())
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an ETag against an If-None-Match header value."""
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+def not_modified(request: Request, response: Response, etag: str) -> Response | None:
+    """
+    Attach caching headers and short-circuit when the client's copy is current.
+
+    Args:
+        request: Incoming request (read for If-None-Match)
+        response: Response whose headers FastAPI merges into the reply
+        etag: Current ETag of the entity
+
+    Returns:
+        A 304 Not Modified response if If-None-Match matches, else None
+    """
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _matches(if_none_match, etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={"ETag": etag, "Cache-Control": CACHE_CONTROL}
+        )
+    return None
@@ -0,0 +1,23 @@
+"""Time-ordered UUID generation for primary keys."""
+import os
+import time
+import uuid
+
+
+def uuid7() -> uuid.UUID:
+    """
+    Generate a UUIDv7 (RFC 9562).
+    
+    The first 48 bits are the Unix time in milliseconds, so successive ids sort
+    by creation time and B-tree inserts land on the right-most index page
+    instead of a random leaf. The remaining bits are random apart from the
+    version and variant fields.
+    
+    Returns:
+        A new version 7 UUID
+    """
+    timestamp_ms = time.time_ns() // 1_000_000
+    value = (timestamp_ms & 0xFFFF_FFFF_FFFF) << 80 | int.from_bytes(os.urandom(10), "big")
+    value = (value & ~(0xF << 76)) | (0x7 << 76)
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)
+    return uuid.UUID(int=value)
@@ -0,0 +1,36 @@
+"""
+Structured JSON log formatting backed by orjson.
+
+Emits the same fields as the previous python-json-logger setup
+(asctime, levelname, name, message plus any `extra` values).
+"""
+import logging
+
+import orjson
+
+
+# Attributes every LogRecord carries; anything else on a record came from `extra`
+_RESERVED_ATTRS = frozenset(
+    vars(logging.LogRecord("", logging.NOTSET, "", 0, "", (), None))
+) | {"message", "asctime"}
+
+
+class OrjsonFormatter(logging.Formatter):
+    """Format log records as single-line JSON objects using orjson."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        log_record = {
+            "asctime": self.formatTime(record),
+            "levelname": record.levelname,
+            "name": record.name,
+            "message": record.getMessage(),
+        }
+
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS:
+                log_record[key] = value
+
+        if record.exc_info:
+            log_record["exc_info"] = self.formatException(record.exc_info)
+
+        return orjson.dumps(log_record, default=str).decode()
@@ -4,59 +4,83 @@ Voice Reminder Service - Backend API
 FastAPI application entry point with middleware configuration.
 """
 import logging
+import logging.handlers
+import queue
 import sys
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from pythonjsonlogger import jsonlogger
+from fastapi.responses import JSONResponse, ORJSONResponse
 import time
 
 from app.config import settings
 from app.database import init_db
+from app import cache, worker_client
+from app.json_logging import OrjsonFormatter
+from app.middleware import SimpleWildcardCORSMiddleware
 from app.routes import users_router, reminders_router, health_router
 
 
 # Configure logging
-def setup_logging():
-    """Configure structured JSON logging."""
+def setup_logging() -> logging.handlers.QueueListener:
+    """
+    Configure structured JSON logging.
+    
+    Records are only enqueued on the calling thread; formatting and the
+    stdout/file writes happen on the returned listener's background thread.
+    
+    Returns:
+        QueueListener that must be started and stopped with the application
+    """
     logger = logging.getLogger()
     logger.setLevel(getattr(logging, settings.LOG_LEVEL.upper()))
     
+    formatter = OrjsonFormatter()
+    
     # Console handler with JSON formatter
     handler = logging.StreamHandler(sys.stdout)
-    formatter = jsonlogger.JsonFormatter(
-        "%(asctime)s %(levelname)s %(name)s %(message)s"
-    )
     handler.setFormatter(formatter)
-    logger.addHandler(handler)
     
     # File handler
     file_handler = logging.FileHandler("backend.log")
     file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
+    
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
 
     logging.getLogger("uvicorn").setLevel(logging.WARNING)
     logging.getLogger("sqlalchemy").setLevel(logging.WARNING)
+    
+    return logging.handlers.QueueListener(
+        log_queue, handler, file_handler, respect_handler_level=True
+    )
 
 
-setup_logging()
+log_listener = setup_logging()
 logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler."""
+    log_listener.start()
     logger.info("Starting Voice Reminder Service API")
-    logger.info(f"Environment: DEBUG={settings.DEBUG}")
+    logger.info("Environment: DEBUG=%s", settings.DEBUG)
     
-    # Initialize database tables
-    init_db()
-    logger.info("Database initialized")
+    # Schema is owned by Alembic (`alembic upgrade head` runs once before the
+    # workers start); create_all is only a local development shortcut
+    if settings.DEBUG:
+        await init_db()
+        logger.info("Database initialized")
     
     yield
     
     logger.info("Shutting down Voice Reminder Service API")
+    await cache.close()
+    await worker_client.close()
+    
+    # Flush queued records before the process exits
+    log_listener.stop()
 
 
 # Create FastAPI application
@@ -65,50 +89,47 @@ app = FastAPI(
     version=settings.APP_VERSION,
     description="Voice Reminder Service - Schedule and manage voice reminders",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     docs_url="/docs",
     redoc_url="/redoc"
 )
 
-# Configure CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.CORS_ORIGINS,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# Configure CORS - allow-all without credentials needs no per-request origin matching
+if settings.CORS_ORIGINS == ("*",) and not settings.CORS_ALLOW_CREDENTIALS:
+    app.add_middleware(SimpleWildcardCORSMiddleware)
+else:
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.CORS_ORIGINS,
+        allow_credentials=settings.CORS_ALLOW_CREDENTIALS,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+
+# Request logging middleware - liveness probes are not logged
+_UNLOGGED_PATHS = frozenset({"/api/health", "/api/"})
 
 
-# Request logging middleware
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
-    """Log all HTTP requests and responses."""
-    start_time = time.time()
+    """Log each HTTP request once, after the response is produced."""
+    if request.url.path in _UNLOGGED_PATHS:
+        return await call_next(request)
     
-    # Console debug
-    print(f"DEBUG: Request to {request.url.path} from {request.client.host if request.client else 'unknown'}")
-
-    # Log request
-    logger.info(
-        f"Request started",
-        extra={
-            "method": request.method,
-            "path": request.url.path,
-            "client": request.client.host if request.client else "unknown"
-        }
-    )
+    start_time = time.perf_counter()
     
     response = await call_next(request)
     
     # Calculate duration
-    duration = time.time() - start_time
+    duration = time.perf_counter() - start_time
     
-    # Log response
     logger.info(
-        f"Request completed",
+        "Request completed",
         extra={
             "method": request.method,
             "path": request.url.path,
+            "client": request.client.host if request.client else "unknown",
             "status_code": response.status_code,
             "duration_ms": round(duration * 1000, 2)
         }
@@ -0,0 +1,62 @@
+"""
+Custom ASGI middleware.
+
+SimpleWildcardCORSMiddleware is a minimal replacement for Starlette's
+CORSMiddleware for the allow-all-origins, no-credentials configuration.
+"""
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+# Headers are prebuilt once; nothing is matched or formatted per request
+_ALLOW_ORIGIN_HEADER = (b"access-control-allow-origin", b"*")
+
+_PREFLIGHT_HEADERS = [
+    _ALLOW_ORIGIN_HEADER,
+    (b"access-control-allow-methods", b"DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT"),
+    (b"access-control-allow-headers", b"*"),
+    (b"access-control-max-age", b"600"),
+    (b"content-type", b"text/plain; charset=utf-8"),
+    (b"content-length", b"2"),
+]
+
+
+class SimpleWildcardCORSMiddleware:
+    """
+    CORS middleware for `CORS_ORIGINS=["*"]` without credentials.
+
+    Every response gets a constant `Access-Control-Allow-Origin: *` header and
+    preflight requests are answered directly with prebuilt headers.
+    """
+
+    def __init__(self, app: ASGIApp):
+        """Wrap the downstream ASGI application."""
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] == "OPTIONS" and self._is_preflight(scope):
+            await send({
+                "type": "http.response.start",
+                "status": 200,
+                "headers": _PREFLIGHT_HEADERS,
+            })
+            await send({"type": "http.response.body", "body": b"OK"})
+            return
+
+        async def send_with_cors(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # Build a new list - the response may reuse its own header list
+                message["headers"] = [*message.get("headers", ()), _ALLOW_ORIGIN_HEADER]
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
+
+    @staticmethod
+    def _is_preflight(scope: Scope) -> bool:
+        """Check for the request header that marks a CORS preflight."""
+        return any(
+            name == b"access-control-request-method" for name, _ in scope["headers"]
+        )
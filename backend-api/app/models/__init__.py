@@ -2,5 +2,6 @@
 from app.models.user import User
 from app.models.reminder import Reminder, ReminderStatus
 from app.models.call_log import CallLog
+from app.models.reminder_status_count import ReminderStatusCount
 
-__all__ = ["User", "Reminder", "ReminderStatus", "CallLog"]
+__all__ = ["User", "Reminder", "ReminderStatus", "CallLog", "ReminderStatusCount"]
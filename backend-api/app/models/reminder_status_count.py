@@ -0,0 +1,30 @@
+"""Per-user reminder status counters, maintained by database triggers."""
+from sqlalchemy import Column, Integer, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from app.database import Base
+
+
+class ReminderStatusCount(Base):
+    """
+    Precomputed reminder counts per user and status.
+    
+    Rows are written only by the `reminders_status_counts` trigger on the
+    reminders table (Alembic revision 004); the application only reads them.
+    
+    Attributes:
+        user_id: Owner user ID (primary key)
+        scheduled: Number of reminders in SCHEDULED
+        processing: Number of reminders in PROCESSING
+        called: Number of reminders in CALLED
+        failed: Number of reminders in FAILED
+    """
+    __tablename__ = "reminder_status_counts"
+    
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    scheduled = Column(Integer, nullable=False, server_default="0")
+    processing = Column(Integer, nullable=False, server_default="0")
+    called = Column(Integer, nullable=False, server_default="0")
+    failed = Column(Integer, nullable=False, server_default="0")
+    
+    def __repr__(self):
+        return f"<ReminderStatusCount(user_id={self.user_id})>"
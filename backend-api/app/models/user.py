@@ -1,10 +1,9 @@
 """User model for storing user information."""
-import uuid
-from datetime import datetime
-from sqlalchemy import Column, String, DateTime
+from sqlalchemy import Column, String, DateTime, func, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.database import Base
+from app.ids import uuid7
 
 
 class User(Base):
@@ -18,14 +17,16 @@ class User(Base):
         updated_at: Timestamp when user was last updated
     """
     __tablename__ = "users"
+    # Fetch server-generated ids/timestamps via RETURNING instead of expiring them
+    __mapper_args__ = {"eager_defaults": True}
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7, server_default=text("gen_random_uuid()"))
     email = Column(String(255), unique=True, nullable=False, index=True)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, server_default=func.timezone("utc", func.now()), nullable=False)
+    updated_at = Column(DateTime, server_default=func.timezone("utc", func.now()), onupdate=func.timezone("utc", func.now()), nullable=False)
     
     # Relationships
-    reminders = relationship("Reminder", back_populates="user", cascade="all, delete-orphan")
+    reminders = relationship("Reminder", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
     
     def __repr__(self):
         return f"<User(id={self.id}, email={self.email})>"
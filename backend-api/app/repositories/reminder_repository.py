@@ -1,10 +1,72 @@
 """Repository for Reminder data access operations."""
 from uuid import UUID
 from datetime import datetime
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from sqlalchemy import select, update, func, literal, literal_column, cast, bindparam, tuple_, Row, Select, Text
+from sqlalchemy.dialects.postgresql import insert as pg_insert, aggregate_order_by, array_agg
 from app.models.reminder import Reminder, ReminderStatus
 from app.models.call_log import CallLog
+from app.models.reminder_status_count import ReminderStatusCount
+
+# Status value -> enum member; a dict lookup is cheaper than ReminderStatus(value)
+# and raises KeyError for unknown values
+_STATUS_MAP = {s.value: s for s in ReminderStatus}
+
+# Status value -> counter column on the trigger-maintained reminder_status_counts table
+_COUNT_COLUMNS = {s.value: getattr(ReminderStatusCount, s.value) for s in ReminderStatus}
+_TOTAL_COUNT = (
+    ReminderStatusCount.scheduled
+    + ReminderStatusCount.processing
+    + ReminderStatusCount.called
+    + ReminderStatusCount.failed
+)
+
+# json_agg over zero rows yields NULL; coalesce to an empty array instead
+_EMPTY_JSON_ARRAY = literal_column("'[]'::json")
+
+
+# Statements for the hottest paths are built once per process and executed with
+# bind parameters, skipping per-call construction and cache-key generation
+_GET_BY_ID = (
+    select(Reminder)
+    .options(selectinload(Reminder.call_logs))
+    .where(Reminder.id == bindparam("reminder_id"))
+)
+
+_CALL_LOG_EXISTS = (
+    select(literal(1))
+    .where(
+        CallLog.external_call_id == bindparam("external_call_id"),
+        CallLog.status == bindparam("status")
+    )
+    .limit(1)
+)
+
+
+# Sort key of a reminder in list order: (scheduled_at, id), newest first
+PageKey = tuple[datetime, UUID]
+
+
+def _paginate(query: Select, skip: int, limit: int, after: PageKey | None) -> Select:
+    """
+    Order a reminder query newest-first and apply keyset or OFFSET paging.
+    
+    Args:
+        query: Select over the reminders table
+        skip: Rows to skip (OFFSET), ignored when after is given
+        limit: Maximum number of rows
+        after: Sort key of the previous page's last row for keyset paging
+        
+    Returns:
+        The paginated Select
+    """
+    if after is not None:
+        # Index range scan on (scheduled_at DESC, id DESC) - cost independent of depth
+        query = query.where(tuple_(Reminder.scheduled_at, Reminder.id) < tuple_(*after))
+    else:
+        query = query.offset(skip)
+    return query.order_by(Reminder.scheduled_at.desc(), Reminder.id.desc()).limit(limit)
 
 
 class ReminderRepository:
@@ -12,12 +74,13 @@ class ReminderRepository:
     Repository class for Reminder CRUD operations.
     Encapsulates all database access for reminders.
     """
+    __slots__ = ("db",)
     
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         """Initialize repository with database session."""
         self.db = db
     
-    def create(
+    async def create(
         self,
         user_id: UUID,
         phone_number: str,
@@ -31,7 +94,7 @@ class ReminderRepository:
             user_id: User's UUID
             phone_number: Phone number to call
             message: Reminder message
-            scheduled_at: When to trigger the reminder
+            scheduled_at: When to trigger the reminder (aware UTC or naive UTC)
             
         Returns:
             Created Reminder instance
@@ -40,15 +103,19 @@ class ReminderRepository:
             user_id=user_id,
             phone_number=phone_number,
             message=message,
-            scheduled_at=scheduled_at,
-            status=ReminderStatus.SCHEDULED
+            # The column is TIMESTAMP WITHOUT TIME ZONE holding UTC, and asyncpg
+            # rejects aware datetimes for it
+            scheduled_at=scheduled_at.replace(tzinfo=None),
+            status=ReminderStatus.SCHEDULED,
+            # A new reminder has no call logs; start the collection loaded so
+            # it is never lazy-loaded (not possible on an AsyncSession)
+            call_logs=[]
         )
         self.db.add(reminder)
-        self.db.commit()
-        self.db.refresh(reminder)
+        await self.db.commit()
         return reminder
     
-    def get_by_id(self, reminder_id: UUID) -> Reminder | None:
+    async def get_by_id(self, reminder_id: UUID) -> Reminder | None:
         """
         Get reminder by ID with call logs.
         
@@ -58,50 +125,127 @@ class ReminderRepository:
         Returns:
             Reminder instance or None if not found
         """
-        return (
-            self.db.query(Reminder)
-            .options(joinedload(Reminder.call_logs))
-            .filter(Reminder.id == reminder_id)
-            .first()
-        )
+        result = await self.db.execute(_GET_BY_ID, {"reminder_id": reminder_id})
+        return result.scalar_one_or_none()
     
-    def get_by_user_id(
+    async def get_by_user_id_json(
         self,
         user_id: UUID,
         status: str | None = None,
         skip: int = 0,
-        limit: int = 10
-    ) -> list[Reminder]:
+        limit: int = 10,
+        after: PageKey | None = None
+    ) -> tuple[str, int, PageKey | None]:
         """
-        Get reminders for a user with optional status filter.
+        Get a page of a user's reminders as a JSON array built by Postgres.
+        
+        Each element has the ReminderResponse shape, call logs included, so the
+        rows are never hydrated into ORM objects or Pydantic models.
         
         Args:
             user_id: User's UUID
             status: Optional status filter
             skip: Number of records to skip
             limit: Maximum number of records to return
+            after: Sort key of the previous page's last row (keyset paging)
             
         Returns:
-            List of Reminder instances
+            Tuple of (JSON array text, total matching reminders, sort key of
+            the last row if the page is full, else None)
+            
+        Raises:
+            KeyError: If status is not a known reminder status
         """
-        query = (
-            self.db.query(Reminder)
-            .options(joinedload(Reminder.call_logs))
-            .filter(Reminder.user_id == user_id)
-        )
+        query = select(
+            Reminder.id,
+            Reminder.user_id,
+            Reminder.phone_number,
+            Reminder.message,
+            Reminder.scheduled_at,
+            Reminder.status,
+            Reminder.external_call_id,
+            Reminder.created_at,
+            Reminder.updated_at,
+            func.count().over().label("total")
+        ).where(Reminder.user_id == user_id)
         
         if status and status != "all":
-            query = query.filter(Reminder.status == ReminderStatus(status))
+            query = query.where(Reminder.status == _STATUS_MAP[status])
         
-        return (
-            query
-            .order_by(Reminder.scheduled_at.desc())
-            .offset(skip)
-            .limit(limit)
-            .all()
+        page = _paginate(query, skip, limit, after).subquery()
+        
+        call_logs_json = (
+            select(
+                func.coalesce(
+                    func.json_agg(
+                        aggregate_order_by(
+                            func.json_build_object(
+                                "id", CallLog.id,
+                                "external_call_id", CallLog.external_call_id,
+                                "status", CallLog.status,
+                                "transcript", CallLog.transcript,
+                                "received_at", CallLog.received_at
+                            ),
+                            CallLog.received_at
+                        )
+                    ),
+                    _EMPTY_JSON_ARRAY
+                )
+            )
+            .where(CallLog.reminder_id == page.c.id)
+            .scalar_subquery()
+        )
+        
+        items_json = func.coalesce(
+            func.json_agg(
+                aggregate_order_by(
+                    func.json_build_object(
+                        "id", page.c.id,
+                        "user_id", page.c.user_id,
+                        "phone_number", page.c.phone_number,
+                        "message", page.c.message,
+                        "scheduled_at", page.c.scheduled_at,
+                        "status", page.c.status,
+                        "external_call_id", page.c.external_call_id,
+                        "created_at", page.c.created_at,
+                        "updated_at", page.c.updated_at,
+                        "call_logs", call_logs_json
+                    ),
+                    page.c.scheduled_at.desc(),
+                    page.c.id.desc()
+                )
+            ),
+            _EMPTY_JSON_ARRAY
         )
+        
+        # The page's last row is the smallest (scheduled_at, id)
+        last_id = array_agg(
+            aggregate_order_by(page.c.id, page.c.scheduled_at.asc(), page.c.id.asc())
+        )[1]
+        
+        result = await self.db.execute(
+            select(
+                cast(items_json, Text),
+                func.max(page.c.total),
+                func.count(),
+                func.min(page.c.scheduled_at),
+                last_id
+            )
+        )
+        items, total, row_count, last_scheduled_at, last_reminder_id = result.one()
+        
+        if after is not None or total is None:
+            # Keyset pages only see rows past the cursor, and an empty page has
+            # no window value - past the end needs a count, page one is empty
+            if after is not None or skip > 0:
+                total = await self.count_by_user_id(user_id, status)
+            else:
+                total = 0
+        
+        last_key = (last_scheduled_at, last_reminder_id) if row_count == limit else None
+        return items, total, last_key
     
-    def count_by_user_id(self, user_id: UUID, status: str | None = None) -> int:
+    async def count_by_user_id(self, user_id: UUID, status: str | None = None) -> int:
         """
         Count reminders for a user.
         
@@ -111,36 +255,22 @@ class ReminderRepository:
             
         Returns:
             Count of reminders
+            
+        Raises:
+            KeyError: If status is not a known reminder status
         """
-        query = self.db.query(func.count(Reminder.id)).filter(Reminder.user_id == user_id)
-        
+        # Single-row primary key lookup on the trigger-maintained counters
         if status and status != "all":
-            query = query.filter(Reminder.status == ReminderStatus(status))
+            column = _COUNT_COLUMNS[status]
+        else:
+            column = _TOTAL_COUNT
         
-        return query.scalar()
-    
-    def get_due_reminders(self, limit: int = 100) -> list[Reminder]:
-        """
-        Get reminders that are due for processing.
-        
-        Args:
-            limit: Maximum number of reminders to fetch
-            
-        Returns:
-            List of due Reminder instances
-        """
-        return (
-            self.db.query(Reminder)
-            .filter(
-                Reminder.status == ReminderStatus.SCHEDULED,
-                Reminder.scheduled_at <= datetime.utcnow()
-            )
-            .order_by(Reminder.scheduled_at.asc())
-            .limit(limit)
-            .all()
+        count = await self.db.scalar(
+            select(column).where(ReminderStatusCount.user_id == user_id)
         )
+        return count or 0
     
-    def update_status(
+    async def update_status(
         self,
         reminder_id: UUID,
         status: ReminderStatus,
@@ -157,16 +287,24 @@ class ReminderRepository:
         Returns:
             Updated Reminder instance or None if not found
         """
-        reminder = self.get_by_id(reminder_id)
-        if reminder:
-            reminder.status = status
-            if external_call_id:
-                reminder.external_call_id = external_call_id
-            self.db.commit()
-            self.db.refresh(reminder)
+        values = {"status": status}
+        if external_call_id:
+            values["external_call_id"] = external_call_id
+        
+        # Single UPDATE ... RETURNING instead of SELECT + flush + refresh
+        result = await self.db.execute(
+            update(Reminder)
+            .where(Reminder.id == reminder_id)
+            .values(**values)
+            .returning(Reminder)
+            .options(selectinload(Reminder.call_logs))
+            .execution_options(synchronize_session=False)
+        )
+        reminder = result.scalar_one_or_none()
+        await self.db.commit()
         return reminder
     
-    def get_by_external_call_id(self, external_call_id: str) -> Reminder | None:
+    async def get_by_external_call_id(self, external_call_id: str) -> Reminder | None:
         """
         Get reminder by external call ID.
         
@@ -176,23 +314,27 @@ class ReminderRepository:
         Returns:
             Reminder instance or None if not found
         """
-        return (
-            self.db.query(Reminder)
-            .options(joinedload(Reminder.call_logs))
-            .filter(Reminder.external_call_id == external_call_id)
-            .first()
+        result = await self.db.execute(
+            select(Reminder)
+            .options(selectinload(Reminder.call_logs))
+            .where(Reminder.external_call_id == external_call_id)
+            .limit(1)
         )
+        return result.scalars().first()
     
-    def add_call_log(
+    async def add_call_log(
         self,
         reminder_id: UUID,
         external_call_id: str,
         status: str,
         transcript: str | None = None
-    ) -> CallLog:
+    ) -> CallLog | None:
         """
         Add a call log entry for a reminder.
         
+        Idempotent: relies on the (external_call_id, status) unique
+        constraint, so a duplicate webhook inserts nothing.
+        
         Args:
             reminder_id: Reminder's UUID
             external_call_id: External call ID
@@ -200,20 +342,24 @@ class ReminderRepository:
             transcript: Optional transcript
             
         Returns:
-            Created CallLog instance
+            Created CallLog instance or None if it was already recorded
         """
-        call_log = CallLog(
-            reminder_id=reminder_id,
-            external_call_id=external_call_id,
-            status=status,
-            transcript=transcript
+        result = await self.db.execute(
+            pg_insert(CallLog)
+            .values(
+                reminder_id=reminder_id,
+                external_call_id=external_call_id,
+                status=status,
+                transcript=transcript
+            )
+            .on_conflict_do_nothing(index_elements=["external_call_id", "status"])
+            .returning(CallLog)
         )
-        self.db.add(call_log)
-        self.db.commit()
-        self.db.refresh(call_log)
+        call_log = result.scalar_one_or_none()
+        await self.db.commit()
         return call_log
     
-    def call_log_exists(self, external_call_id: str, status: str) -> bool:
+    async def call_log_exists(self, external_call_id: str, status: str) -> bool:
         """
         Check if a call log with given external_call_id and status exists.
         Used for idempotency checks.
@@ -225,54 +371,117 @@ class ReminderRepository:
         Returns:
             True if exists, False otherwise
         """
-        return (
-            self.db.query(CallLog)
-            .filter(
-                CallLog.external_call_id == external_call_id,
-                CallLog.status == status
-            )
-            .first() is not None
+        result = await self.db.execute(
+            _CALL_LOG_EXISTS, {"external_call_id": external_call_id, "status": status}
         )
+        return result.first() is not None
     
-    def get_all(self, skip: int = 0, limit: int = 10) -> list[Reminder]:
+    async def get_all(
+        self,
+        skip: int = 0,
+        limit: int = 10,
+        after: PageKey | None = None
+    ) -> list[Reminder]:
         """
         Get all reminders with pagination.
         
         Args:
             skip: Number of records to skip
             limit: Maximum number of records to return
+            after: Sort key of the previous page's last row (keyset paging)
             
         Returns:
             List of Reminder instances
         """
-        return (
-            self.db.query(Reminder)
-            .options(joinedload(Reminder.call_logs))
-            .order_by(Reminder.scheduled_at.desc())
-            .offset(skip)
+        result = await self.db.execute(
+            _paginate(
+                select(Reminder).options(selectinload(Reminder.call_logs)),
+                skip,
+                limit,
+                after
+            )
+        )
+        return list(result.scalars().all())
+    
+    async def get_updated_since(self, since: datetime, limit: int = 50) -> list[Row]:
+        """
+        Get the most recently updated reminders with their latest call log.
+        
+        A row_number() window over each reminder's logs keeps only the newest
+        one, outer-joined onto the reminders in a single query. Rows are plain
+        column tuples - no ORM objects are built - ready for orjson to encode.
+        
+        Args:
+            since: Only include reminders updated at or after this time
+            limit: Maximum number of records to return
+            
+        Returns:
+            Rows of (id, user_id, phone_number, message, status, updated_at,
+            external_call_id, log_status, log_transcript, log_received_at),
+            with the ids as strings,
+            newest update first; log columns are None without a call log
+        """
+        ranked_logs = (
+            select(
+                CallLog.reminder_id,
+                CallLog.status,
+                CallLog.transcript,
+                CallLog.received_at,
+                func.row_number().over(
+                    partition_by=CallLog.reminder_id,
+                    order_by=CallLog.received_at.desc()
+                ).label("rn")
+            )
+            .join(Reminder, Reminder.id == CallLog.reminder_id)
+            .where(Reminder.updated_at >= since)
+            .cte("ranked_logs")
+        )
+        result = await self.db.execute(
+            select(
+                # Ids as text: orjson cannot encode asyncpg's UUID subclass
+                cast(Reminder.id, Text),
+                cast(Reminder.user_id, Text),
+                Reminder.phone_number,
+                Reminder.message,
+                Reminder.status,
+                Reminder.updated_at,
+                Reminder.external_call_id,
+                ranked_logs.c.status.label("log_status"),
+                ranked_logs.c.transcript.label("log_transcript"),
+                ranked_logs.c.received_at.label("log_received_at")
+            )
+            .outerjoin(
+                ranked_logs,
+                (ranked_logs.c.reminder_id == Reminder.id) & (ranked_logs.c.rn == 1)
+            )
+            .where(Reminder.updated_at >= since)
+            .order_by(Reminder.updated_at.desc())
             .limit(limit)
-            .all()
         )
+        return list(result.all())
     
-    def count(self) -> int:
+    async def count(self) -> int:
         """
         Count total number of reminders.
         
         Returns:
             Total reminder count
         """
-        return self.db.query(func.count(Reminder.id)).scalar()
+        count = await self.db.scalar(
+            select(func.sum(_TOTAL_COUNT))
+        )
+        return count or 0
     
-    def count_by_status(self) -> dict:
+    async def count_by_status(self) -> dict:
         """
         Count reminders grouped by status.
         
+        Sums the per-user counters instead of grouping the reminders table.
+        
         Returns:
             Dictionary with status counts
         """
-        results = (
-            self.db.query(Reminder.status, func.count(Reminder.id))
-            .group_by(Reminder.status)
-            .all()
+        result = await self.db.execute(
+            select(*(func.coalesce(func.sum(column), 0) for column in _COUNT_COLUMNS.values()))
         )
-        return {status.value: count for status, count in results}
+        return dict(zip(_COUNT_COLUMNS, result.one()))
@@ -1,21 +1,52 @@
 """Repository for User data access operations."""
 from uuid import UUID
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from cachetools import TTLCache
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete, exists, func
+from app.config import settings
 from app.models.user import User
 
+# Process-wide user lookup caches, separate from SQLAlchemy's statement cache.
+# Only hits are cached; create/delete invalidate, other processes see changes
+# once the TTL expires.
+_users_by_id: TTLCache = TTLCache(maxsize=settings.USER_CACHE_SIZE, ttl=settings.USER_CACHE_TTL_SECONDS)
+_users_by_email: TTLCache = TTLCache(maxsize=settings.USER_CACHE_SIZE, ttl=settings.USER_CACHE_TTL_SECONDS)
+
+
+def _cache_user(user: User) -> None:
+    """Store a user in both lookup caches."""
+    _users_by_id[user.id] = user
+    _users_by_email[user.email] = user
+
+
+async def user_exists(db: AsyncSession, user_id: UUID) -> bool:
+    """
+    Check that a user exists without loading the row.
+    
+    Args:
+        db: Database session
+        user_id: User's UUID
+        
+    Returns:
+        True if the user exists
+    """
+    if user_id in _users_by_id:
+        return True
+    return await db.scalar(select(exists().where(User.id == user_id)))
+
 
 class UserRepository:
     """
     Repository class for User CRUD operations.
     Encapsulates all database access for users.
     """
+    __slots__ = ("db",)
     
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         """Initialize repository with database session."""
         self.db = db
     
-    def create(self, email: str) -> User:
+    async def create(self, email: str) -> User:
         """
         Create a new user.
         
@@ -27,13 +58,15 @@ class UserRepository:
         """
         user = User(email=email)
         self.db.add(user)
-        self.db.commit()
-        self.db.refresh(user)
+        # id/timestamps come back via INSERT ... RETURNING (eager_defaults),
+        # and expire_on_commit=False keeps them loaded - no refresh SELECT
+        await self.db.commit()
+        _cache_user(user)
         return user
     
-    def get_by_id(self, user_id: UUID) -> User | None:
+    async def get_by_id(self, user_id: UUID) -> User | None:
         """
-        Get user by ID.
+        Get user by ID, served from the TTL cache when possible.
         
         Args:
             user_id: User's UUID
@@ -41,11 +74,28 @@ class UserRepository:
         Returns:
             User instance or None if not found
         """
-        return self.db.query(User).filter(User.id == user_id).first()
+        user = _users_by_id.get(user_id)
+        if user is None:
+            user = await self.db.scalar(select(User).where(User.id == user_id))
+            if user is not None:
+                _cache_user(user)
+        return user
+    
+    async def exists(self, user_id: UUID) -> bool:
+        """
+        Check that a user exists without loading the row.
+        
+        Args:
+            user_id: User's UUID
+            
+        Returns:
+            True if the user exists
+        """
+        return await user_exists(self.db, user_id)
     
-    def get_by_email(self, email: str) -> User | None:
+    async def get_by_email(self, email: str) -> User | None:
         """
-        Get user by email.
+        Get user by email, served from the TTL cache when possible.
         
         Args:
             email: User's email address
@@ -53,9 +103,14 @@ class UserRepository:
         Returns:
             User instance or None if not found
         """
-        return self.db.query(User).filter(User.email == email).first()
+        user = _users_by_email.get(email)
+        if user is None:
+            user = await self.db.scalar(select(User).where(User.email == email))
+            if user is not None:
+                _cache_user(user)
+        return user
     
-    def get_all(self, skip: int = 0, limit: int = 10) -> list[User]:
+    async def get_all(self, skip: int = 0, limit: int = 10) -> list[User]:
         """
         Get all users with pagination.
         
@@ -66,18 +121,24 @@ class UserRepository:
         Returns:
             List of User instances
         """
-        return self.db.query(User).offset(skip).limit(limit).all()
+        # Order by the primary key so pages are stable and OFFSET/LIMIT walks
+        # the PK index (UUIDv7 ids make this creation order for new users)
+        result = await self.db.execute(
+            select(User).order_by(User.id).offset(skip).limit(limit)
+        )
+        return list(result.scalars().all())
     
-    def count(self) -> int:
+    async def count(self) -> int:
         """
         Count total number of users.
         
         Returns:
             Total user count
         """
-        return self.db.query(func.count(User.id)).scalar()
+        # Bare count(*) - no column, ORDER BY or join, so an index-only scan qualifies
+        return await self.db.scalar(select(func.count()).select_from(User))
     
-    def delete(self, user_id: UUID) -> bool:
+    async def delete(self, user_id: UUID) -> bool:
         """
         Delete user by ID.
         
@@ -87,9 +148,14 @@ class UserRepository:
         Returns:
             True if deleted, False if not found
         """
-        user = self.get_by_id(user_id)
-        if user:
-            self.db.delete(user)
-            self.db.commit()
-            return True
-        return False
+        # Single DELETE; reminders and call logs go via ON DELETE CASCADE
+        email = await self.db.scalar(
+            delete(User).where(User.id == user_id).returning(User.email)
+        )
+        await self.db.commit()
+        
+        _users_by_id.pop(user_id, None)
+        if email is None:
+            return False
+        _users_by_email.pop(email, None)
+        return True
@@ -1,10 +1,25 @@
 """Health check endpoints."""
 from fastapi import APIRouter
+from fastapi.responses import ORJSONResponse, Response
 from datetime import datetime
+import orjson
 from app.config import settings
 
 router = APIRouter(prefix="/api", tags=["Health"])
 
+# Static parts of the responses are built once; probes hit these every second
+_STATIC = {
+    "status": "healthy",
+    "app": settings.APP_NAME,
+    "version": settings.APP_VERSION
+}
+
+_ROOT_BODY = orjson.dumps({
+    "message": f"Welcome to {settings.APP_NAME}",
+    "version": settings.APP_VERSION,
+    "docs": "/docs"
+})
+
 
 @router.get("/health")
 async def health_check():
@@ -14,12 +29,7 @@ async def health_check():
     Returns:
         Application health status with version and timestamp
     """
-    return {
-        "status": "healthy",
-        "app": settings.APP_NAME,
-        "version": settings.APP_VERSION,
-        "timestamp": datetime.utcnow().isoformat()
-    }
+    return ORJSONResponse({**_STATIC, "timestamp": datetime.utcnow().isoformat()})
 
 
 @router.get("/")
@@ -30,8 +40,4 @@ async def root():
     Returns:
         Welcome message with API information
     """
-    return {
-        "message": f"Welcome to {settings.APP_NAME}",
-        "version": settings.APP_VERSION,
-        "docs": "/docs"
-    }
+    return Response(content=_ROOT_BODY, media_type="application/json")
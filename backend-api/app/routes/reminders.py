@@ -1,9 +1,14 @@
 """Reminder API endpoints."""
 import logging
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, status, Query
+from fastapi.responses import ORJSONResponse, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
+from app.cache import cached, notifications_cache_ttl, STATS_CACHE_KEY, NOTIFICATIONS_CACHE_KEY
+from app.http_cache import not_modified, weak_etag
+from app.config import settings
+from app.worker_client import wake_scheduler
 from app.schemas.reminder import (
     ReminderCreate,
     ReminderResponse,
@@ -14,17 +19,24 @@ from app.services.reminder_service import (
     ReminderService,
     ReminderNotFoundError,
     UserNotFoundError,
-    InvalidScheduleTimeError
+    InvalidStatusFilterError,
+    InvalidCursorError
 )
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api", tags=["Reminders"])
 
+# Status filter -> repository status argument (ALL means no filter)
+_STATUS_FILTERS: dict[ReminderStatusFilter, str | None] = {
+    f: (None if f is ReminderStatusFilter.ALL else f.value) for f in ReminderStatusFilter
+}
+
 
 @router.post("/reminders", response_model=ReminderResponse, status_code=status.HTTP_201_CREATED)
 async def create_reminder(
     data: ReminderCreate,
-    db: Session = Depends(get_db)
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Create a new reminder.
@@ -34,49 +46,57 @@ async def create_reminder(
     - **message**: Message to be spoken in the call
     - **scheduled_at**: When to trigger the reminder (must be in future)
     
-    Returns 201 Created on success, 400/404 on validation errors.
+    Returns 201 Created on success, 404 if the user does not exist, 422 on validation errors.
     """
-    logger.info(f"POST /api/reminders - User: {data.user_id}, Phone: {data.phone_number}")
+    logger.info("POST /api/reminders - User: %s, Phone: %s", data.user_id, data.phone_number)
     
     try:
         service = ReminderService(db)
-        reminder = service.create_reminder(data)
-        logger.info(f"Reminder created: {reminder.id}")
+        reminder = await service.create_reminder(data)
+        logger.info("Reminder created: %s", reminder.id)
+        # Let the worker re-plan its sleep in case this reminder is due sooner
+        background_tasks.add_task(wake_scheduler)
         return reminder
     except UserNotFoundError as e:
-        logger.warning(f"Reminder creation failed - user not found: {data.user_id}")
+        logger.warning("Reminder creation failed - user not found: %s", data.user_id)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e)
         )
-    except InvalidScheduleTimeError as e:
-        logger.warning(f"Reminder creation failed - invalid time: {data.scheduled_at}")
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=str(e)
-        )
 
 
 @router.get("/reminders", response_model=ReminderListResponse)
 async def list_all_reminders(
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(10, ge=1, le=100, description="Items per page"),
-    db: Session = Depends(get_db)
+    cursor: str | None = Query(None, description="next_cursor of the previous page; replaces page"),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     List all reminders with pagination.
     
     - **page**: Page number (default: 1)
     - **size**: Items per page (default: 10, max: 100)
+    - **cursor**: Keyset cursor from a previous response (optional)
     """
-    logger.info(f"GET /api/reminders - page={page}, size={size}")
+    logger.info("GET /api/reminders - page=%s, size=%s", page, size)
     
-    service = ReminderService(db)
-    return service.list_all_reminders(page=page, size=size)
+    try:
+        service = ReminderService(db)
+        # Returned directly to skip re-validating every item against response_model
+        return ORJSONResponse(
+            await service.list_all_reminders(page=page, size=size, cursor=cursor)
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
 
 
 @router.get("/reminders/stats")
-async def get_reminder_stats(db: Session = Depends(get_db)):
+@cached(key=STATS_CACHE_KEY, ttl=settings.STATS_CACHE_TTL_SECONDS)
+async def get_reminder_stats(db: AsyncSession = Depends(get_db)):
     """
     Get reminder statistics.
     
@@ -85,13 +105,15 @@ async def get_reminder_stats(db: Session = Depends(get_db)):
     logger.info("GET /api/reminders/stats")
     
     service = ReminderService(db)
-    return service.get_stats()
+    return await service.get_stats()
 
 
 @router.get("/reminders/{reminder_id}", response_model=ReminderResponse)
 async def get_reminder(
     reminder_id: UUID,
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get reminder by ID.
@@ -99,27 +121,34 @@ async def get_reminder(
     - **reminder_id**: Reminder's unique identifier (UUID)
     
     Returns full reminder details including status and call logs.
+    Sends an ETag; returns 304 Not Modified when If-None-Match still matches.
     """
-    logger.info(f"GET /api/reminders/{reminder_id}")
+    logger.info("GET /api/reminders/%s", reminder_id)
     
     try:
         service = ReminderService(db)
-        return service.get_reminder(reminder_id)
+        reminder = await service.get_reminder(reminder_id)
     except ReminderNotFoundError as e:
-        logger.warning(f"Reminder not found: {reminder_id}")
+        logger.warning("Reminder not found: %s", reminder_id)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e)
         )
+    
+    # Call logs are part of the payload, so they version the ETag too
+    etag = weak_etag(reminder.updated_at.timestamp(), len(reminder.call_logs))
+    return not_modified(request, response, etag) or reminder
 
 
 @router.get("/users/{user_id}/reminders", response_model=ReminderListResponse)
 async def list_user_reminders(
     user_id: UUID,
-    status: ReminderStatusFilter = Query(ReminderStatusFilter.ALL, description="Filter by status"),
+    # Named status_filter so it does not shadow fastapi's `status` module used below
+    status_filter: ReminderStatusFilter = Query(ReminderStatusFilter.ALL, alias="status", description="Filter by status"),
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(10, ge=1, le=100, description="Items per page"),
-    db: Session = Depends(get_db)
+    cursor: str | None = Query(None, description="next_cursor of the previous page; replaces page"),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     List reminders for a specific user.
@@ -128,78 +157,51 @@ async def list_user_reminders(
     - **status**: Filter by reminder status (optional)
     - **page**: Page number (default: 1)
     - **size**: Items per page (default: 10, max: 100)
+    - **cursor**: Keyset cursor from a previous response (optional)
     """
-    logger.info(f"GET /api/users/{user_id}/reminders - status={status}, page={page}")
+    logger.info("GET /api/users/%s/reminders - status=%s, page=%s", user_id, status_filter, page)
     
     try:
         service = ReminderService(db)
-        return service.list_user_reminders(
+        # Body is built by Postgres; response_model above only documents the shape
+        body = await service.list_user_reminders_json(
             user_id=user_id,
-            status=status.value if status != ReminderStatusFilter.ALL else None,
+            status=_STATUS_FILTERS[status_filter],
             page=page,
-            size=size
+            size=size,
+            cursor=cursor
         )
+        return Response(content=body, media_type="application/json")
     except UserNotFoundError as e:
-        logger.warning(f"User not found: {user_id}")
+        logger.warning("User not found: %s", user_id)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e)
         )
+    except (InvalidStatusFilterError, InvalidCursorError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
 
 
 @router.get("/reminders/notifications/recent")
+@cached(key=NOTIFICATIONS_CACHE_KEY, ttl=notifications_cache_ttl, conditional=True)
 async def get_recent_notifications(
+    request: Request,
     since_seconds: int = Query(30, ge=1, le=300, description="Get updates from last N seconds"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get recent reminder updates for real-time notifications.
     
     Returns reminders that have been updated in the last N seconds.
-    Useful for polling-based real-time updates in the frontend.
+    Useful for polling-based real-time updates in the frontend. Polls that
+    send back the last ETag in If-None-Match get a 304 until something changes.
     
     - **since_seconds**: Look back this many seconds (default: 30, max: 300)
     """
-    from datetime import datetime, timedelta
-    from app.models.reminder import Reminder
-    
-    logger.debug(f"GET /api/reminders/notifications/recent - since={since_seconds}s")
-    
-    cutoff_time = datetime.utcnow() - timedelta(seconds=since_seconds)
-    
-    # Get reminders updated since cutoff time
-    recent_reminders = (
-        db.query(Reminder)
-        .filter(Reminder.updated_at >= cutoff_time)
-        .order_by(Reminder.updated_at.desc())
-        .limit(50)
-        .all()
-    )
-    
-    notifications = []
-    for reminder in recent_reminders:
-        # Get the latest call log if available
-        latest_log = None
-        if reminder.call_logs:
-            latest_log = max(reminder.call_logs, key=lambda x: x.received_at)
-        
-        notifications.append({
-            "reminder_id": str(reminder.id),
-            "user_id": str(reminder.user_id),
-            "phone_number": reminder.phone_number,
-            "message": reminder.message,
-            "status": reminder.status.value,
-            "updated_at": reminder.updated_at.isoformat(),
-            "external_call_id": reminder.external_call_id,
-            "latest_log": {
-                "status": latest_log.status,
-                "transcript": latest_log.transcript,
-                "received_at": latest_log.received_at.isoformat()
-            } if latest_log else None
-        })
-    
-    return {
-        "count": len(notifications),
-        "since_seconds": since_seconds,
-        "notifications": notifications
-    }
+    logger.debug("GET /api/reminders/notifications/recent - since=%ss", since_seconds)
+    
+    service = ReminderService(db)
+    return await service.get_recent_notifications(since_seconds)
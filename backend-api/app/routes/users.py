@@ -1,9 +1,10 @@
 """User API endpoints."""
 import logging
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
+from app.http_cache import not_modified, weak_etag
 from app.schemas.user import UserCreate, UserResponse, UserListResponse
 from app.services.user_service import (
     UserService,
@@ -18,7 +19,7 @@ router = APIRouter(prefix="/api/users", tags=["Users"])
 @router.post("", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def create_user(
     data: UserCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Create a new user.
@@ -27,15 +28,15 @@ async def create_user(
     
     Returns 201 Created on success, 400 Bad Request if user exists.
     """
-    logger.info(f"POST /api/users - Creating user: {data.email}")
+    logger.info("POST /api/users - Creating user: %s", data.email)
     
     try:
         service = UserService(db)
-        user = service.create_user(data)
-        logger.info(f"User created: {user.id}")
+        user = await service.create_user(data)
+        logger.info("User created: %s", user.id)
         return user
     except UserAlreadyExistsError as e:
-        logger.warning(f"User creation failed: {str(e)}")
+        logger.warning("User creation failed: %s", e)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
@@ -46,7 +47,7 @@ async def create_user(
 async def list_users(
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(10, ge=1, le=100, description="Items per page"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     List all users with pagination.
@@ -54,39 +55,45 @@ async def list_users(
     - **page**: Page number (default: 1)
     - **size**: Items per page (default: 10, max: 100)
     """
-    logger.info(f"GET /api/users - page={page}, size={size}")
+    logger.info("GET /api/users - page=%s, size=%s", page, size)
     
     service = UserService(db)
-    return service.list_users(page=page, size=size)
+    return await service.list_users(page=page, size=size)
 
 
 @router.get("/{user_id}", response_model=UserResponse)
 async def get_user(
     user_id: UUID,
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get user by ID.
     
     - **user_id**: User's unique identifier (UUID)
+    
+    Sends an ETag; returns 304 Not Modified when If-None-Match still matches.
     """
-    logger.info(f"GET /api/users/{user_id}")
+    logger.info("GET /api/users/%s", user_id)
     
     try:
         service = UserService(db)
-        return service.get_user(user_id)
+        user = await service.get_user(user_id)
     except UserNotFoundError as e:
-        logger.warning(f"User not found: {user_id}")
+        logger.warning("User not found: %s", user_id)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e)
         )
+    
+    return not_modified(request, response, weak_etag(user.updated_at.timestamp())) or user
 
 
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_user(
     user_id: UUID,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Delete user by ID.
@@ -95,13 +102,13 @@ async def delete_user(
     
     Note: This will also delete all reminders for this user.
     """
-    logger.info(f"DELETE /api/users/{user_id}")
+    logger.info("DELETE /api/users/%s", user_id)
     
     try:
         service = UserService(db)
-        service.delete_user(user_id)
+        await service.delete_user(user_id)
     except UserNotFoundError as e:
-        logger.warning(f"User not found: {user_id}")
+        logger.warning("User not found: %s", user_id)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e)
@@ -1,11 +1,33 @@
 """Pydantic schemas for Reminder API."""
-from datetime import datetime
+from datetime import datetime, timezone
+from functools import lru_cache
 from uuid import UUID
 from enum import Enum
 from pydantic import BaseModel, ConfigDict, field_validator
 import phonenumbers
 
 
+@lru_cache(maxsize=4096)
+def _parse_e164(v: str) -> str:
+    """
+    Parse and validate a phone number, returning it in E.164 format.
+    
+    Cached because phonenumbers parsing is pure Python and the same numbers
+    recur across a user's reminders. Invalid input raises and is not cached.
+    
+    Raises:
+        ValueError: If the number is malformed or not a valid number
+    """
+    try:
+        # Parse the phone number (assume international format with +)
+        parsed = phonenumbers.parse(v, None)
+    except phonenumbers.NumberParseException:
+        raise ValueError("Invalid phone number format. Use international format like +1234567890")
+    if not phonenumbers.is_valid_number(parsed):
+        raise ValueError("Invalid phone number")
+    return phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164)
+
+
 class ReminderStatusEnum(str, Enum):
     """Reminder status enum for API responses."""
     SCHEDULED = "scheduled"
@@ -44,15 +66,7 @@ class ReminderBase(BaseModel):
     @classmethod
     def validate_phone_number(cls, v: str) -> str:
         """Validate phone number format using phonenumbers library."""
-        try:
-            # Parse the phone number (assume international format with +)
-            parsed = phonenumbers.parse(v, None)
-            if not phonenumbers.is_valid_number(parsed):
-                raise ValueError("Invalid phone number")
-            # Return in E.164 format
-            return phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164)
-        except phonenumbers.NumberParseException:
-            raise ValueError("Invalid phone number format. Use international format like +1234567890")
+        return _parse_e164(v)
     
     @field_validator("message")
     @classmethod
@@ -65,14 +79,19 @@ class ReminderBase(BaseModel):
     @field_validator("scheduled_at")
     @classmethod
     def validate_scheduled_at(cls, v: datetime) -> datetime:
-        """Validate scheduled_at is in the future."""
-        # TEMPORARILY DISABLED FOR TESTING - Allow past times
-        # Make both datetimes timezone-naive for comparison
-        # now = datetime.utcnow()
-        # scheduled_naive = v.replace(tzinfo=None) if v.tzinfo else v
+        """
+        Validate scheduled_at is in the future and normalize it to aware UTC.
+        
+        Input without an offset is taken to be UTC. Everything downstream can
+        then compare against datetime.now(timezone.utc) without converting.
+        """
+        if v.tzinfo is None:
+            v = v.replace(tzinfo=timezone.utc)
+        elif v.utcoffset():
+            v = v.astimezone(timezone.utc)
         
-        # if scheduled_naive <= now:
-        #     raise ValueError("Scheduled time must be in the future")
+        if v <= datetime.now(timezone.utc):
+            raise ValueError("Scheduled time must be in the future")
         return v
 
 
@@ -126,6 +145,8 @@ class ReminderListResponse(BaseModel):
     page: int
     size: int
     pages: int
+    # Pass back as `cursor` to fetch the following page; None on the last page
+    next_cursor: str | None = None
 
 
 class ReminderStatusFilter(str, Enum):
@@ -1,16 +1,15 @@
 """Service layer for Reminder business logic."""
+import base64
 import logging
 from uuid import UUID
-from datetime import datetime
-from sqlalchemy.orm import Session
-from app.repositories.reminder_repository import ReminderRepository
-from app.repositories.user_repository import UserRepository
-from app.schemas.reminder import (
-    ReminderCreate,
-    ReminderResponse,
-    ReminderListResponse
-)
+from datetime import datetime, timedelta
+import orjson
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.repositories.reminder_repository import ReminderRepository, PageKey
+from app.repositories.user_repository import user_exists
+from app.schemas.reminder import ReminderCreate, ReminderResponse
 from app.models.reminder import ReminderStatus
+from app import cache
 
 logger = logging.getLogger(__name__)
 
@@ -30,24 +29,88 @@ class UserNotFoundError(ReminderServiceError):
     pass
 
 
-class InvalidScheduleTimeError(ReminderServiceError):
-    """Raised when scheduled time is invalid."""
+class InvalidStatusFilterError(ReminderServiceError):
+    """Raised when a status filter is not a known reminder status."""
     pass
 
 
+class InvalidCursorError(ReminderServiceError):
+    """Raised when a pagination cursor cannot be decoded."""
+    pass
+
+
+def encode_cursor(key: PageKey) -> str:
+    """Encode the (scheduled_at, id) sort key of a page's last item as an opaque cursor."""
+    scheduled_at, reminder_id = key
+    raw = orjson.dumps({"ts": scheduled_at.isoformat(), "id": str(reminder_id)})
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(cursor: str) -> PageKey:
+    """
+    Decode a cursor produced by encode_cursor.
+    
+    Args:
+        cursor: Opaque cursor string from a list response
+        
+    Returns:
+        (scheduled_at, id) sort key of the previous page's last item
+        
+    Raises:
+        InvalidCursorError: If the cursor is malformed
+    """
+    try:
+        data = orjson.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(data["ts"]), UUID(data["id"])
+    except (ValueError, KeyError, TypeError) as e:
+        raise InvalidCursorError("Invalid pagination cursor") from e
+
+
+def reminder_to_dict(reminder) -> dict:
+    """
+    Build the ReminderResponse shape from an ORM reminder without validation.
+    
+    Datetimes and the status enum are left for orjson to encode natively, which
+    produces the same JSON as ReminderResponse. UUIDs are stringified because
+    asyncpg returns its own UUID subclass, which orjson does not recognise.
+    """
+    return {
+        "id": str(reminder.id),
+        "user_id": str(reminder.user_id),
+        "phone_number": reminder.phone_number,
+        "message": reminder.message,
+        "scheduled_at": reminder.scheduled_at,
+        "status": reminder.status,
+        "external_call_id": reminder.external_call_id,
+        "created_at": reminder.created_at,
+        "updated_at": reminder.updated_at,
+        "call_logs": [
+            {
+                "id": str(log.id),
+                "external_call_id": log.external_call_id,
+                "status": log.status,
+                "transcript": log.transcript,
+                "received_at": log.received_at
+            }
+            for log in reminder.call_logs
+        ]
+    }
+
+
 class ReminderService:
     """
     Service class for Reminder business logic.
     Implements domain rules, validation, and state management.
     """
     
-    def __init__(self, db: Session):
+    __slots__ = ("db", "repository")
+    
+    def __init__(self, db: AsyncSession):
         """Initialize service with database session."""
         self.db = db
         self.repository = ReminderRepository(db)
-        self.user_repository = UserRepository(db)
     
-    def create_reminder(self, data: ReminderCreate) -> ReminderResponse:
+    async def create_reminder(self, data: ReminderCreate) -> ReminderResponse:
         """
         Create a new reminder.
         
@@ -59,33 +122,27 @@ class ReminderService:
             
         Raises:
             UserNotFoundError: If user does not exist
-            InvalidScheduleTimeError: If scheduled_at is in the past
         """
-        logger.info(f"Creating reminder for user {data.user_id}")
+        logger.info("Creating reminder for user %s", data.user_id)
         
         # Validate user exists
-        user = self.user_repository.get_by_id(data.user_id)
-        if not user:
-            logger.warning(f"User not found: {data.user_id}")
+        if not await user_exists(self.db, data.user_id):
+            logger.warning("User not found: %s", data.user_id)
             raise UserNotFoundError(f"User with ID {data.user_id} not found")
         
-        # Double-check scheduled_at is in the future (Pydantic also validates)
-        scheduled_naive = data.scheduled_at.replace(tzinfo=None) if data.scheduled_at.tzinfo else data.scheduled_at
-        if scheduled_naive <= datetime.utcnow():
-            logger.warning(f"Invalid schedule time: {data.scheduled_at}")
-            raise InvalidScheduleTimeError("Scheduled time must be in the future")
-        
-        reminder = self.repository.create(
+        reminder = await self.repository.create(
             user_id=data.user_id,
             phone_number=data.phone_number,
             message=data.message,
             scheduled_at=data.scheduled_at
         )
         
-        logger.info(f"Reminder created: {reminder.id} for user {data.user_id}")
+        await cache.invalidate(cache.STATS_CACHE_KEY)
+        
+        logger.info("Reminder created: %s for user %s", reminder.id, data.user_id)
         return ReminderResponse.model_validate(reminder)
     
-    def get_reminder(self, reminder_id: UUID) -> ReminderResponse:
+    async def get_reminder(self, reminder_id: UUID) -> ReminderResponse:
         """
         Get reminder by ID.
         
@@ -98,114 +155,182 @@ class ReminderService:
         Raises:
             ReminderNotFoundError: If reminder not found
         """
-        reminder = self.repository.get_by_id(reminder_id)
+        reminder = await self.repository.get_by_id(reminder_id)
         if not reminder:
-            logger.warning(f"Reminder not found: {reminder_id}")
+            logger.warning("Reminder not found: %s", reminder_id)
             raise ReminderNotFoundError(f"Reminder with ID {reminder_id} not found")
         
         return ReminderResponse.model_validate(reminder)
     
-    def list_user_reminders(
+    async def list_user_reminders_json(
         self,
         user_id: UUID,
         status: str | None = None,
         page: int = 1,
-        size: int = 10
-    ) -> ReminderListResponse:
+        size: int = 10,
+        cursor: str | None = None
+    ) -> bytes:
         """
-        List reminders for a user with optional filtering.
+        List reminders for a user as a serialized ReminderListResponse.
+        
+        The items JSON is produced by Postgres and spliced in as-is, skipping
+        ORM and Pydantic work.
         
         Args:
             user_id: User's UUID
             status: Optional status filter
-            page: Page number (1-indexed)
+            page: Page number (1-indexed), ignored when cursor is given
             size: Items per page
+            cursor: Cursor from a previous page's next_cursor (keyset paging)
             
         Returns:
-            ReminderListResponse with paginated reminders
+            JSON body of a ReminderListResponse
             
         Raises:
             UserNotFoundError: If user not found
+            InvalidStatusFilterError: If status is not a known reminder status
+            InvalidCursorError: If cursor is malformed
         """
+        after = decode_cursor(cursor) if cursor else None
+        
         # Validate user exists
-        user = self.user_repository.get_by_id(user_id)
-        if not user:
-            logger.warning(f"User not found: {user_id}")
+        if not await user_exists(self.db, user_id):
+            logger.warning("User not found: %s", user_id)
             raise UserNotFoundError(f"User with ID {user_id} not found")
         
         skip = (page - 1) * size
-        reminders = self.repository.get_by_user_id(
-            user_id=user_id,
-            status=status,
-            skip=skip,
-            limit=size
-        )
-        total = self.repository.count_by_user_id(user_id, status)
+        try:
+            items, total, last_key = await self.repository.get_by_user_id_json(
+                user_id=user_id,
+                status=status,
+                skip=skip,
+                limit=size,
+                after=after
+            )
+        except KeyError:
+            raise InvalidStatusFilterError(f"Unknown reminder status: {status}")
+        
         pages = (total + size - 1) // size if total > 0 else 1
         
-        logger.info(f"Listed reminders for user {user_id}: page={page}, total={total}")
+        logger.info("Listed reminders for user %s: page=%s, total=%s", user_id, page, total)
         
-        return ReminderListResponse(
-            items=[ReminderResponse.model_validate(r) for r in reminders],
-            total=total,
-            page=page,
-            size=size,
-            pages=pages
-        )
+        next_cursor = orjson.dumps(encode_cursor(last_key) if last_key else None).decode()
+        
+        return (
+            f'{{"items":{items},"total":{total},"page":{page},'
+            f'"size":{size},"pages":{pages},"next_cursor":{next_cursor}}}'
+        ).encode()
     
-    def list_all_reminders(
+    async def list_all_reminders(
         self,
         page: int = 1,
-        size: int = 10
-    ) -> ReminderListResponse:
+        size: int = 10,
+        cursor: str | None = None
+    ) -> dict:
         """
         List all reminders with pagination.
         
+        Items are plain dicts (see reminder_to_dict) rather than validated
+        models; the route hands the result straight to ORJSONResponse.
+        
         Args:
-            page: Page number (1-indexed)
+            page: Page number (1-indexed), ignored when cursor is given
             size: Items per page
+            cursor: Cursor from a previous page's next_cursor (keyset paging)
             
         Returns:
-            ReminderListResponse with paginated reminders
+            Dictionary in the ReminderListResponse shape
+            
+        Raises:
+            InvalidCursorError: If cursor is malformed
         """
+        after = decode_cursor(cursor) if cursor else None
         skip = (page - 1) * size
-        reminders = self.repository.get_all(skip=skip, limit=size)
-        total = self.repository.count()
+        reminders = await self.repository.get_all(skip=skip, limit=size, after=after)
+        total = await self.repository.count()
         pages = (total + size - 1) // size if total > 0 else 1
         
-        logger.info(f"Listed all reminders: page={page}, total={total}")
+        logger.info("Listed all reminders: page=%s, total=%s", page, total)
         
-        return ReminderListResponse(
-            items=[ReminderResponse.model_validate(r) for r in reminders],
-            total=total,
-            page=page,
-            size=size,
-            pages=pages
+        next_cursor = (
+            encode_cursor((reminders[-1].scheduled_at, reminders[-1].id))
+            if len(reminders) == size else None
         )
+        
+        return {
+            "items": [reminder_to_dict(r) for r in reminders],
+            "total": total,
+            "page": page,
+            "size": size,
+            "pages": pages,
+            "next_cursor": next_cursor
+        }
     
-    def get_stats(self) -> dict:
+    async def get_stats(self) -> dict:
         """
         Get reminder statistics.
         
         Returns:
             Dictionary with total and counts by status
         """
-        total = self.repository.count()
-        by_status = self.repository.count_by_status()
+        # One query - every status is counted, so the total is their sum
+        by_status = await self.repository.count_by_status()
         
         # Ensure all statuses are present
         stats = {
-            "total": total,
+            "total": sum(by_status.values()),
             "scheduled": by_status.get("scheduled", 0),
             "processing": by_status.get("processing", 0),
             "called": by_status.get("called", 0),
             "failed": by_status.get("failed", 0)
         }
         
-        logger.info(f"Stats retrieved: {stats}")
+        logger.info("Stats retrieved: %s", stats)
         return stats
     
-    def update_status(
+    async def get_recent_notifications(self, since_seconds: int) -> dict:
+        """
+        Get recent reminder updates for real-time notifications.
+        
+        Args:
+            since_seconds: Look back this many seconds
+            
+        Returns:
+            Dictionary with count, since_seconds and the notifications list,
+            holding raw datetime/enum values meant for orjson
+        """
+        cutoff_time = datetime.utcnow() - timedelta(seconds=since_seconds)
+        rows = await self.repository.get_updated_since(cutoff_time)
+        
+        # Datetimes and the status enum are left for orjson to encode in C
+        notifications = [
+            {
+                "reminder_id": reminder_id,
+                "user_id": user_id,
+                "phone_number": phone_number,
+                "message": message,
+                "status": status,
+                "updated_at": updated_at,
+                "external_call_id": external_call_id,
+                "latest_log": {
+                    "status": log_status,
+                    "transcript": log_transcript,
+                    "received_at": log_received_at
+                } if log_received_at is not None else None
+            }
+            for (
+                reminder_id, user_id, phone_number, message, status, updated_at,
+                external_call_id, log_status, log_transcript, log_received_at
+            ) in rows
+        ]
+        
+        return {
+            "count": len(notifications),
+            "since_seconds": since_seconds,
+            "notifications": notifications
+        }
+    
+    async def update_status(
         self,
         reminder_id: UUID,
         status: str,
@@ -225,7 +350,7 @@ class ReminderService:
         Raises:
             ReminderNotFoundError: If reminder not found
         """
-        reminder = self.repository.update_status(
+        reminder = await self.repository.update_status(
             reminder_id=reminder_id,
             status=ReminderStatus(status),
             external_call_id=external_call_id
@@ -234,5 +359,8 @@ class ReminderService:
         if not reminder:
             raise ReminderNotFoundError(f"Reminder with ID {reminder_id} not found")
         
-        logger.info(f"Reminder {reminder_id} status updated to {status}")
+        await cache.invalidate(cache.STATS_CACHE_KEY)
+        await cache.invalidate_pattern(cache.NOTIFICATIONS_CACHE_PATTERN)
+        
+        logger.info("Reminder %s status updated to %s", reminder_id, status)
         return ReminderResponse.model_validate(reminder)
@@ -1,14 +1,18 @@
 """Service layer for User business logic."""
 import logging
 from uuid import UUID
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
+from pydantic import TypeAdapter
 from app.repositories.user_repository import UserRepository
 from app.schemas.user import UserCreate, UserResponse, UserListResponse
 from app.models.user import User
 
 logger = logging.getLogger(__name__)
 
+# Validates a whole page of ORM rows in one call instead of one model_validate per row
+_USER_LIST_ADAPTER = TypeAdapter(list[UserResponse])
+
 
 class UserServiceError(Exception):
     """Base exception for UserService errors."""
@@ -31,11 +35,13 @@ class UserService:
     Implements domain rules and validation.
     """
     
-    def __init__(self, db: Session):
+    __slots__ = ("repository",)
+    
+    def __init__(self, db: AsyncSession):
         """Initialize service with database session."""
         self.repository = UserRepository(db)
     
-    def create_user(self, data: UserCreate) -> UserResponse:
+    async def create_user(self, data: UserCreate) -> UserResponse:
         """
         Create a new user.
         
@@ -48,23 +54,23 @@ class UserService:
         Raises:
             UserAlreadyExistsError: If user with email already exists
         """
-        logger.info(f"Creating user with email: {data.email}")
+        logger.info("Creating user with email: %s", data.email)
         
         # Check if user already exists
-        existing = self.repository.get_by_email(data.email)
+        existing = await self.repository.get_by_email(data.email)
         if existing:
-            logger.warning(f"User with email {data.email} already exists")
+            logger.warning("User with email %s already exists", data.email)
             raise UserAlreadyExistsError(f"User with email {data.email} already exists")
         
         try:
-            user = self.repository.create(email=data.email)
-            logger.info(f"User created successfully: {user.id}")
+            user = await self.repository.create(email=data.email)
+            logger.info("User created successfully: %s", user.id)
             return UserResponse.model_validate(user)
         except IntegrityError:
-            logger.error(f"IntegrityError creating user: {data.email}")
+            logger.error("IntegrityError creating user: %s", data.email)
             raise UserAlreadyExistsError(f"User with email {data.email} already exists")
     
-    def get_user(self, user_id: UUID) -> UserResponse:
+    async def get_user(self, user_id: UUID) -> UserResponse:
         """
         Get user by ID.
         
@@ -77,14 +83,14 @@ class UserService:
         Raises:
             UserNotFoundError: If user not found
         """
-        user = self.repository.get_by_id(user_id)
+        user = await self.repository.get_by_id(user_id)
         if not user:
-            logger.warning(f"User not found: {user_id}")
+            logger.warning("User not found: %s", user_id)
             raise UserNotFoundError(f"User with ID {user_id} not found")
         
         return UserResponse.model_validate(user)
     
-    def list_users(self, page: int = 1, size: int = 10) -> UserListResponse:
+    async def list_users(self, page: int = 1, size: int = 10) -> UserListResponse:
         """
         List all users with pagination.
         
@@ -96,21 +102,22 @@ class UserService:
             UserListResponse with paginated users
         """
         skip = (page - 1) * size
-        users = self.repository.get_all(skip=skip, limit=size)
-        total = self.repository.count()
+        users = await self.repository.get_all(skip=skip, limit=size)
+        total = await self.repository.count()
         pages = (total + size - 1) // size if total > 0 else 1
         
-        logger.info(f"Listed users: page={page}, size={size}, total={total}")
+        logger.info("Listed users: page=%s, size=%s, total=%s", page, size, total)
         
-        return UserListResponse(
-            items=[UserResponse.model_validate(u) for u in users],
+        # Envelope fields are computed here, so skip validating them again
+        return UserListResponse.model_construct(
+            items=_USER_LIST_ADAPTER.validate_python(users, from_attributes=True),
             total=total,
             page=page,
             size=size,
             pages=pages
         )
     
-    def user_exists(self, user_id: UUID) -> bool:
+    async def user_exists(self, user_id: UUID) -> bool:
         """
         Check if user exists.
         
@@ -120,9 +127,9 @@ class UserService:
         Returns:
             True if user exists, False otherwise
         """
-        return self.repository.get_by_id(user_id) is not None
+        return await self.repository.exists(user_id)
     
-    def delete_user(self, user_id: UUID) -> bool:
+    async def delete_user(self, user_id: UUID) -> bool:
         """
         Delete user by ID.
         
@@ -135,8 +142,8 @@ class UserService:
         Raises:
             UserNotFoundError: If user not found
         """
-        if not self.repository.delete(user_id):
+        if not await self.repository.delete(user_id):
             raise UserNotFoundError(f"User with ID {user_id} not found")
         
-        logger.info(f"User deleted: {user_id}")
+        logger.info("User deleted: %s", user_id)
         return True
@@ -0,0 +1,35 @@
+"""
+Client for the worker service's scheduler control endpoint.
+
+Waking the worker is best effort: without WORKER_URL it is skipped, and
+failures are logged - the worker still picks reminders up on its next tick.
+"""
+import logging
+
+import httpx
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Short timeout - this runs after the response and must never pile up
+worker_client: httpx.AsyncClient | None = (
+    httpx.AsyncClient(base_url=settings.WORKER_URL, timeout=2.0)
+    if settings.WORKER_URL else None
+)
+
+
+async def wake_scheduler() -> None:
+    """Ask the worker to re-check due reminders now."""
+    if worker_client is None:
+        return
+    try:
+        await worker_client.post("/scheduler/wake")
+    except httpx.HTTPError as e:
+        logger.warning("Worker wake-up failed: %s", e)
+
+
+async def close() -> None:
+    """Close the HTTP client on shutdown."""
+    if worker_client is not None:
+        await worker_client.aclose()
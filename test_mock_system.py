@@ -58,9 +58,9 @@ async def test_complete_flow():
             print(f"Error creating user: {e}")
             return
         
-        # Step 3: Create a reminder with past time (will be processed immediately)
-        print("Step 3: Creating reminder with past time...")
-        past_time = (datetime.utcnow() - timedelta(minutes=1)).isoformat() + "Z"
+        # Step 3: Create a reminder a few seconds out (past times are rejected)
+        print("Step 3: Creating reminder due in 5 seconds...")
+        due_time = (datetime.utcnow() + timedelta(seconds=5)).isoformat() + "Z"
         
         try:
             reminder_response = await client.post(
@@ -69,7 +69,7 @@ async def test_complete_flow():
                     "user_id": user_id,
                     "phone_number": "+1234567890",
                     "message": "This is a test reminder for mock system",
-                    "scheduled_at": past_time
+                    "scheduled_at": due_time
                 }
             )
             
@@ -88,9 +88,9 @@ async def test_complete_flow():
             print(f" Error creating reminder: {e}")
             return
         
-        # Step 4: Wait for worker to process (scheduler runs every 20-30 seconds)
+        # Step 4: Wait for the reminder to become due and the worker to process it
         print("Step 4: Waiting for worker to process reminder...")
-        print("   (Worker checks every 20-30 seconds)")
+        print("   (Due in 5 seconds; the worker sleeps until the next due reminder)")
         print()
         
         max_wait = 60  # Wait up to 60 seconds
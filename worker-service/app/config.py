@@ -17,6 +17,14 @@ class Settings(BaseSettings):
     # Credentials must be provided in .env file
     DATABASE_URL: str
     
+    # Connection pool - sized for a claimed batch processed concurrently
+    POOL_SIZE: int = 10
+    POOL_OVERFLOW: int = 20
+    
+    # Set when connecting through PgBouncer in transaction pooling mode, which
+    # cannot keep server-side prepared statements across transactions
+    PGBOUNCER: bool = False
+    
     # Infobip API - SMS/Voice Provider
     INFOBIP_API_KEY: str = ""
     INFOBIP_BASE_URL: str = "https://jr5ryn.api.infobip.com"
@@ -33,15 +41,15 @@ class Settings(BaseSettings):
     WEBHOOK_SECRET: str = ""
     WEBHOOK_URL: str = ""  # Public URL for receiving webhooks
     
-    # CORS
-    CORS_ORIGINS: list[str] | str = ["http://localhost:3000", "http://localhost:5173"]
+    # CORS - parsed once into an immutable tuple
+    CORS_ORIGINS: tuple[str, ...] | str = ("http://localhost:3000", "http://localhost:5173")
 
     @field_validator("CORS_ORIGINS", mode="before")
     @classmethod
     def parse_cors_origins(cls, v):
         if isinstance(v, str) and not v.startswith("["):
-            return [origin.strip() for origin in v.split(",")]
-        return v
+            return tuple(origin.strip() for origin in v.split(","))
+        return tuple(v) if isinstance(v, list) else v
     
     # Logging
     LOG_LEVEL: str = "INFO"
@@ -1,40 +1,74 @@
 """
 Database connection for Worker Service.
 Shares the same database as the API service.
+Uses SQLAlchemy async engine with psycopg's async driver.
 """
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.orm import declarative_base
 from app.config import settings
 
-# Create SQLAlchemy engine
-engine = create_engine(
-    settings.DATABASE_URL,
+# DATABASE_URL names sync psycopg (it is shared with the API's Alembic); the
+# worker drives the same driver in async mode
+ASYNC_DATABASE_URL = make_url(settings.DATABASE_URL).set(drivername="postgresql+psycopg_async")
+
+# psycopg prepares a statement server-side once it has run this many times on
+# a connection, so the scheduler's repeated queries skip parse/plan. PgBouncer
+# (transaction mode) cannot keep prepared statements, so it turns this off.
+CONNECT_ARGS = {"prepare_threshold": None if settings.PGBOUNCER else 1}
+
+# Create SQLAlchemy async engine
+engine = create_async_engine(
+    ASYNC_DATABASE_URL,
     pool_pre_ping=True,
-    pool_size=5,
-    max_overflow=10,
+    pool_size=settings.POOL_SIZE,
+    max_overflow=settings.POOL_OVERFLOW,
+    connect_args=CONNECT_ARGS,
     echo=settings.DEBUG
 )
 
 # Session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# expire_on_commit=False: an attribute expired by commit would be reloaded on
+# next access, an implicit IO that AsyncSession cannot do outside an await
+SessionLocal = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
 
 # Base class for models
 Base = declarative_base()
 
 
-def get_db():
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
     Dependency that provides database session.
     """
-    db = SessionLocal()
-    try:
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 
-def get_db_session():
+def get_db_session() -> AsyncSession:
     """
     Get a database session for non-FastAPI contexts (scheduler jobs).
+    
+    Use as `async with get_db_session() as db:` so it is always closed.
     """
     return SessionLocal()
+
+
+@asynccontextmanager
+async def pipeline(db: AsyncSession):
+    """
+    Run the enclosed statements in psycopg pipeline mode.
+    
+    Statements are sent without waiting for each reply, so a run of writes
+    followed by a commit costs one round-trip. Only use it for statements
+    whose results are not read (Core UPDATE/INSERT without RETURNING); ORM
+    flushes that fetch server defaults do not work inside it.
+    
+    Args:
+        db: Database session whose connection to pipeline
+    """
+    connection = await db.connection()
+    raw_connection = await connection.get_raw_connection()
+    async with raw_connection.driver_connection.pipeline():
+        yield
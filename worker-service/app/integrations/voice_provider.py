@@ -5,7 +5,9 @@ Handles communication with Infobip Voice API for TTS calls.
 Includes mock mode for development/testing.
 """
 import logging
+import random
 import httpx
+import orjson
 import uuid
 from dataclasses import dataclass
 from typing import Optional
@@ -13,6 +15,43 @@ from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Keep-alive connections held open to Infobip; callers size their concurrency to it
+MAX_KEEPALIVE_CONNECTIONS = 20
+
+# Infobip's send responses are a few hundred bytes; anything far larger is refused unread
+MAX_RESPONSE_BYTES = 64 * 1024
+
+# How much of a response body to copy into logs and error messages
+LOGGED_BODY_BYTES = 512
+
+
+async def _read_capped(response: httpx.Response, limit: int) -> bytes:
+    """
+    Read a streamed response body, refusing bodies larger than limit.
+    
+    Args:
+        response: Response opened with client.stream()
+        limit: Maximum body size in bytes
+        
+    Returns:
+        The response body
+        
+    Raises:
+        ValueError: If Content-Length or the bytes received exceed limit
+    """
+    content_length = response.headers.get("content-length")
+    if content_length is not None and int(content_length) > limit:
+        raise ValueError(f"Response body too large: {content_length} bytes")
+    
+    chunks = []
+    size = 0
+    async for chunk in response.aiter_bytes():
+        size += len(chunk)
+        if size > limit:
+            raise ValueError(f"Response body exceeds {limit} bytes")
+        chunks.append(chunk)
+    return b"".join(chunks)
+
 
 @dataclass
 class CallResponse:
@@ -39,16 +78,47 @@ class InfobipVoiceClient:
         # Use mock mode if explicitly enabled OR if no API key
         self.mock_mode = settings.MOCK_MODE or not bool(self.api_key)
         self.mock_success_rate = settings.MOCK_CALL_SUCCESS_RATE
+        # Success threshold on a 32-bit random draw - integer compare per mock call
+        self._mock_threshold = int(self.mock_success_rate * (1 << 32))
+        
+        # Per-message fields that never change - only to/text/callbackData vary
+        self._msg_from = self.from_number or "VoiceReminder"
+        self._notify_fields = (
+            {"notifyUrl": settings.WEBHOOK_URL, "notifyContentType": "application/json"}
+            if settings.WEBHOOK_URL else {}
+        )
+        
+        # One long-lived client so keep-alive connections (and HTTP/2) are
+        # reused across calls instead of a TCP+TLS handshake per SMS
+        self._client: httpx.AsyncClient | None = None
+        if not self.mock_mode:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=httpx.Timeout(30.0),
+                # Batches can be minutes apart; keep idle connections past
+                # httpx's 5s default so the next batch skips the handshake
+                limits=httpx.Limits(
+                    max_connections=100,
+                    max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=60.0
+                ),
+                http2=True,
+                headers={
+                    "Authorization": f"App {self.api_key}",
+                    "Content-Type": "application/json",
+                    "Accept": "application/json"
+                }
+            )
         
         if self.mock_mode:
             logger.warning("🎭 Infobip SMS running in MOCK mode - simulating SMS without real API")
-            logger.info(f"Mock success rate: {self.mock_success_rate * 100}%")
+            logger.info("Mock success rate: %s%%", self.mock_success_rate * 100)
             logger.info("💡 In mock mode: No real SMS sent, UI notifications shown instead")
         else:
-            logger.info(f"📱 Infobip SMS configured: {self.base_url}")
+            logger.info("📱 Infobip SMS configured: %s", self.base_url)
             logger.info("📱 Real SMS will be sent to user's phone")
             if self.from_number:
-                logger.info(f"Using Infobip sender: {self.from_number}")
+                logger.info("Using Infobip sender: %s", self.from_number)
             else:
                 logger.warning("No Infobip sender configured - using default 'VoiceReminder'")
     
@@ -69,14 +139,14 @@ class InfobipVoiceClient:
         Returns:
             CallResponse with call details
         """
-        logger.info(f"Creating call for reminder {reminder_id} to {phone_number}")
+        logger.info("Creating call for reminder %s to %s", reminder_id, phone_number)
         
         if self.mock_mode:
-            return await self._mock_create_call(phone_number, message, reminder_id)
+            return self._mock_create_call(phone_number, message, reminder_id)
         
         return await self._real_create_call(phone_number, message, reminder_id)
     
-    async def _mock_create_call(
+    def _mock_create_call(
         self,
         phone_number: str,
         message: str,
@@ -86,25 +156,25 @@ class InfobipVoiceClient:
         Mock call creation for development/testing.
         
         Simulates call success/failure based on success rate.
-        Generates a fake call_id and mock transcript.
+        Generates a fake call_id and mock transcript. Plain function - nothing
+        here awaits, so create_call returns its result without a coroutine.
         """
-        import random
-        
         mock_call_id = f"mock-{reminder_id}"
         
         # Simulate success/failure based on configured rate
-        is_success = random.random() < self.mock_success_rate
+        is_success = random.getrandbits(32) < self._mock_threshold
         
         if is_success:
-            logger.info(
-                f"🎭 [MOCK] Call created successfully: {mock_call_id}",
-                extra={
-                    "phone_number": phone_number,
-                    "message_preview": message[:50],
-                    "reminder_id": reminder_id,
-                    "mock_status": "success"
-                }
-            )
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "🎭 [MOCK] Call created successfully: %s", mock_call_id,
+                    extra={
+                        "phone_number": phone_number,
+                        "message_preview": message[:50],
+                        "reminder_id": reminder_id,
+                        "mock_status": "success"
+                    }
+                )
             
             return CallResponse(
                 call_id=mock_call_id,
@@ -112,15 +182,16 @@ class InfobipVoiceClient:
                 success=True
             )
         else:
-            logger.warning(
-                f"🎭 [MOCK] Call failed (simulated): {mock_call_id}",
-                extra={
-                    "phone_number": phone_number,
-                    "message_preview": message[:50],
-                    "reminder_id": reminder_id,
-                    "mock_status": "failed"
-                }
-            )
+            if logger.isEnabledFor(logging.WARNING):
+                logger.warning(
+                    "🎭 [MOCK] Call failed (simulated): %s", mock_call_id,
+                    extra={
+                        "phone_number": phone_number,
+                        "message_preview": message[:50],
+                        "reminder_id": reminder_id,
+                        "mock_status": "failed"
+                    }
+                )
             
             return CallResponse(
                 call_id=mock_call_id,
@@ -146,7 +217,7 @@ class InfobipVoiceClient:
             payload = {
                 "messages": [
                     {
-                        "from": self.from_number if self.from_number else "VoiceReminder",
+                        "from": self._msg_from,
                         "destinations": [
                             {
                                 "to": phone_number
@@ -154,77 +225,67 @@ class InfobipVoiceClient:
                         ],
                         "text": f"🔔 Reminder: {message}",
                         "callbackData": reminder_id,
-                        "notifyUrl": f"{settings.WEBHOOK_URL}" if hasattr(settings, 'WEBHOOK_URL') else None,
-                        "notifyContentType": "application/json"
+                        **self._notify_fields
                     }
                 ]
             }
             
-            # Remove notifyUrl if not configured
-            if not payload["messages"][0]["notifyUrl"]:
-                del payload["messages"][0]["notifyUrl"]
-                del payload["messages"][0]["notifyContentType"]
+            logger.info("Sending SMS via Infobip: %s/sms/2/text/advanced", self.base_url)
+            logger.info("Phone: %s, Message: %s...", phone_number, message[:50])
+            logger.debug("Full payload: %s", payload)
             
-            logger.info(f"Sending SMS via Infobip: {self.base_url}/sms/2/text/advanced")
-            logger.info(f"Phone: {phone_number}, Message: {message[:50]}...")
-            logger.debug(f"Full payload: {payload}")
+            async with self._client.stream("POST", "/sms/2/text/advanced", json=payload) as response:
+                body = await _read_capped(response, MAX_RESPONSE_BYTES)
             
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    f"{self.base_url}/sms/2/text/advanced",
-                    headers={
-                        "Authorization": f"App {self.api_key}",
-                        "Content-Type": "application/json",
-                        "Accept": "application/json"
-                    },
-                    json=payload
+            logger.info("Infobip response status: %s", response.status_code)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Infobip response body: %s",
+                    body[:LOGGED_BODY_BYTES].decode("utf-8", "replace")
                 )
+            
+            if response.status_code in [200, 201]:
+                data = orjson.loads(body)
+                # Infobip returns bulkId and messages array
+                bulk_id = data.get("bulkId", "")
+                messages = data.get("messages", [])
                 
-                logger.info(f"Infobip response status: {response.status_code}")
-                logger.info(f"Infobip response body: {response.text}")
-                
-                if response.status_code in [200, 201]:
-                    data = response.json()
-                    # Infobip returns bulkId and messages array
-                    bulk_id = data.get("bulkId", "")
-                    messages = data.get("messages", [])
+                if messages and len(messages) > 0:
+                    message_data = messages[0]
+                    message_id = message_data.get("messageId", bulk_id)
+                    status = message_data.get("status", {}).get("groupName", "PENDING")
                     
-                    if messages and len(messages) > 0:
-                        message_data = messages[0]
-                        message_id = message_data.get("messageId", bulk_id)
-                        status = message_data.get("status", {}).get("groupName", "PENDING")
-                        
-                        logger.info(f"SMS sent successfully: {message_id}")
-                        logger.info(f"User will see reminder on their phone 📱")
-                        
-                        return CallResponse(
-                            call_id=message_id,
-                            status=status.lower(),
-                            success=True
-                        )
-                    else:
-                        error_msg = "No messages in response"
-                        logger.error(f"Failed to send SMS: {error_msg}")
-                        return CallResponse(
-                            call_id="",
-                            status="failed",
-                            success=False,
-                            error_message=error_msg
-                        )
-                else:
-                    error_msg = f"API returned {response.status_code}: {response.text}"
-                    logger.error(f"Failed to send SMS: {error_msg}")
+                    logger.info("SMS sent successfully: %s", message_id)
+                    logger.info("User will see reminder on their phone 📱")
                     
+                    return CallResponse(
+                        call_id=message_id,
+                        status=status.lower(),
+                        success=True
+                    )
+                else:
+                    error_msg = "No messages in response"
+                    logger.error("Failed to send SMS: %s", error_msg)
                     return CallResponse(
                         call_id="",
                         status="failed",
                         success=False,
                         error_message=error_msg
                     )
-                    
+            else:
+                error_msg = f"API returned {response.status_code}: {body[:LOGGED_BODY_BYTES].decode('utf-8', 'replace')}"
+                logger.error("Failed to send SMS: %s", error_msg)
+                
+                return CallResponse(
+                    call_id="",
+                    status="failed",
+                    success=False,
+                    error_message=error_msg
+                )
+                
         except httpx.TimeoutException:
             error_msg = "Request timeout"
-            logger.error(f"Voice provider timeout: {error_msg}")
+            logger.error("Voice provider timeout: %s", error_msg)
             return CallResponse(
                 call_id="",
                 status="failed",
@@ -233,14 +294,47 @@ class InfobipVoiceClient:
             )
         except Exception as e:
             error_msg = str(e)
-            logger.error(f"Voice provider error: {error_msg}", exc_info=True)
+            logger.error("Voice provider error: %s", error_msg, exc_info=True)
             return CallResponse(
                 call_id="",
                 status="failed",
                 success=False,
                 error_message=error_msg
             )
+    
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client and its connections."""
+        if self._client is not None:
+            await self._client.aclose()
+
+
+# Process-wide instance, created and closed by the app lifespan so its pooled
+# HTTP client belongs to the running event loop rather than the importer's
+_voice_provider: InfobipVoiceClient | None = None
+
+
+def init_voice_provider() -> InfobipVoiceClient:
+    """Create the shared voice provider client (called at startup)."""
+    global _voice_provider
+    _voice_provider = InfobipVoiceClient()
+    return _voice_provider
+
+
+def get_voice_provider() -> InfobipVoiceClient:
+    """
+    Get the shared voice provider client.
+    
+    Raises:
+        RuntimeError: If called before the app lifespan has started
+    """
+    if _voice_provider is None:
+        raise RuntimeError("Voice provider is not initialized; it is created in the app lifespan")
+    return _voice_provider
 
 
-# Singleton instance
-voice_provider = InfobipVoiceClient()
+async def close_voice_provider() -> None:
+    """Close the shared voice provider client (called at shutdown)."""
+    global _voice_provider
+    if _voice_provider is not None:
+        await _voice_provider.aclose()
+        _voice_provider = None
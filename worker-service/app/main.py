@@ -1,77 +1,100 @@
 """
 Voice Reminder Service - Worker Service
 
-FastAPI application with APScheduler for processing reminders.
+FastAPI application with a background scheduler task for processing reminders.
 """
+import asyncio
 import logging
+import logging.handlers
+import queue
 import sys
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.triggers.interval import IntervalTrigger
-from pythonjsonlogger import jsonlogger
+from fastapi.responses import ORJSONResponse, Response
+import orjson
 import time
 
 from app.config import settings
+from app.database import engine
+from app.json_logging import OrjsonFormatter
 from app.routes.webhooks import router as webhooks_router
-from app.scheduler.reminder_scheduler import run_scheduler_sync
+from app.routes.scheduler import router as scheduler_router
+from app.scheduler.reminder_scheduler import run_scheduler_loop
+from app.integrations.voice_provider import init_voice_provider, close_voice_provider
 
 
 # Configure logging
-def setup_logging():
-    """Configure structured JSON logging."""
+def setup_logging() -> logging.handlers.QueueListener:
+    """
+    Configure structured JSON logging.
+    
+    Records are only enqueued on the calling thread; formatting and the
+    stdout/file writes happen on the returned listener's background thread.
+    
+    Returns:
+        QueueListener that must be started and stopped with the application
+    """
     logger = logging.getLogger()
     logger.setLevel(getattr(logging, settings.LOG_LEVEL.upper()))
     
+    formatter = OrjsonFormatter()
+    
     handler = logging.StreamHandler(sys.stdout)
-    formatter = jsonlogger.JsonFormatter(
-        "%(asctime)s %(levelname)s %(name)s %(message)s"
-    )
     handler.setFormatter(formatter)
-    logger.addHandler(handler)
     
     # File handler
     file_handler = logging.FileHandler("worker.log")
     file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
+    
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
 
     logging.getLogger("uvicorn").setLevel(logging.WARNING)
     logging.getLogger("sqlalchemy").setLevel(logging.WARNING)
-    logging.getLogger("apscheduler").setLevel(logging.INFO)
+    
+    return logging.handlers.QueueListener(
+        log_queue, handler, file_handler, respect_handler_level=True
+    )
 
 
-setup_logging()
+log_listener = setup_logging()
 logger = logging.getLogger(__name__)
 
-# APScheduler instance
-scheduler = BackgroundScheduler()
+# Scheduler task - runs on the app's event loop, so the voice provider's
+# pooled HTTP client is used from the loop that owns it
+scheduler_task: asyncio.Task | None = None
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler."""
+    global scheduler_task
+    log_listener.start()
     logger.info("Starting Voice Reminder Worker Service")
-    logger.info(f"Scheduler interval: {settings.SCHEDULER_INTERVAL_SECONDS} seconds")
+    logger.info("Scheduler max interval: %s seconds", settings.SCHEDULER_INTERVAL_SECONDS)
+    
+    app.state.voice_provider = init_voice_provider()
     
     # Start the scheduler
-    scheduler.add_job(
-        run_scheduler_sync,
-        trigger=IntervalTrigger(seconds=settings.SCHEDULER_INTERVAL_SECONDS),
-        id="process_due_reminders",
-        name="Process Due Reminders",
-        replace_existing=True
-    )
-    scheduler.start()
+    scheduler_task = asyncio.create_task(run_scheduler_loop())
     logger.info("Scheduler started")
     
     yield
     
     # Shutdown scheduler
     logger.info("Shutting down scheduler...")
-    scheduler.shutdown(wait=False)
+    scheduler_task.cancel()
+    try:
+        await scheduler_task
+    except asyncio.CancelledError:
+        pass
+    await close_voice_provider()
+    await engine.dispose()
     logger.info("Worker service shutdown complete")
+    
+    # Flush queued records before the process exits
+    log_listener.stop()
 
 
 # Create FastAPI application
@@ -80,28 +103,39 @@ app = FastAPI(
     version=settings.APP_VERSION,
     description="Voice Reminder Worker Service - Processes reminders and handles webhooks",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     docs_url="/docs",
     redoc_url="/redoc"
 )
 
-# Configure CORS
+# Configure CORS - Starlette checks `origin in allow_origins`, so hand it a set
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=settings.CORS_ORIGINS,
+    allow_origins=frozenset(settings.CORS_ORIGINS),
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
 
+# Load balancer probes and the root banner - not worth a log line each
+_UNLOGGED_PATHS = frozenset({"/health", "/"})
+
+
 # Request logging middleware
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
     """Log all HTTP requests and responses."""
-    start_time = time.time()
+    if request.url.path in _UNLOGGED_PATHS:
+        return await call_next(request)
+    
+    if not logger.isEnabledFor(logging.INFO):
+        return await call_next(request)
+    
+    start_time = time.perf_counter()
     
     logger.info(
-        f"Request started",
+        "Request started",
         extra={
             "method": request.method,
             "path": request.url.path
@@ -109,10 +143,10 @@ async def log_requests(request: Request, call_next):
     )
     
     response = await call_next(request)
-    duration = time.time() - start_time
+    duration = time.perf_counter() - start_time
     
     logger.info(
-        f"Request completed",
+        "Request completed",
         extra={
             "method": request.method,
             "path": request.url.path,
@@ -128,24 +162,39 @@ async def log_requests(request: Request, call_next):
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     """Handle all unhandled exceptions."""
-    logger.error(f"Unhandled exception: {str(exc)}", exc_info=True)
-    return JSONResponse(
+    logger.error("Unhandled exception: %s", exc, exc_info=True)
+    return ORJSONResponse(
         status_code=500,
         content={"detail": "Internal server error"}
     )
 
 
+# Both possible health bodies are built once; probes hit this every second
+_HEALTH_RUNNING = orjson.dumps({
+    "status": "healthy",
+    "service": "worker",
+    "scheduler": "running",
+    "version": settings.APP_VERSION
+})
+_HEALTH_STOPPED = orjson.dumps({
+    "status": "degraded",
+    "service": "worker",
+    "scheduler": "stopped",
+    "version": settings.APP_VERSION
+})
+_HEALTH_HEADERS = {"Cache-Control": "max-age=1"}
+
+
 # Health check
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
-    scheduler_running = scheduler.running
-    return {
-        "status": "healthy" if scheduler_running else "degraded",
-        "service": "worker",
-        "scheduler": "running" if scheduler_running else "stopped",
-        "version": settings.APP_VERSION
-    }
+    scheduler_running = scheduler_task is not None and not scheduler_task.done()
+    return Response(
+        content=_HEALTH_RUNNING if scheduler_running else _HEALTH_STOPPED,
+        media_type="application/json",
+        headers=_HEALTH_HEADERS
+    )
 
 
 @app.get("/")
@@ -160,6 +209,7 @@ async def root():
 
 # Include routers
 app.include_router(webhooks_router)
+app.include_router(scheduler_router)
 
 
 if __name__ == "__main__":
@@ -168,5 +218,8 @@ if __name__ == "__main__":
         "app.main:app",
         host="0.0.0.0",
         port=8001,
+        # Both ship with uvicorn[standard]; pinned so a missing extra fails loudly
+        loop="uvloop",
+        http="httptools",
         reload=settings.DEBUG
     )
@@ -1,26 +1,28 @@
 """CallLog model - copied from backend-api for consistency."""
-import uuid
-from datetime import datetime
-from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Index
+from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Index, UniqueConstraint, func, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.database import Base
+from app.ids import uuid7
 
 
 class CallLog(Base):
     """CallLog model representing a voice call log entry."""
     __tablename__ = "call_logs"
+    # Fetch server-generated ids/timestamps via RETURNING instead of expiring them
+    __mapper_args__ = {"eager_defaults": True}
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7, server_default=text("gen_random_uuid()"))
     reminder_id = Column(UUID(as_uuid=True), ForeignKey("reminders.id", ondelete="CASCADE"), nullable=False)
     external_call_id = Column(String(255), nullable=False, index=True)
     status = Column(String(50), nullable=False)
     transcript = Column(Text, nullable=True)
-    received_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    received_at = Column(DateTime, server_default=func.timezone("utc", func.now()), nullable=False)
     
     reminder = relationship("Reminder", back_populates="call_logs")
     
     __table_args__ = (
-        Index("ix_call_logs_reminder_id", "reminder_id"),
-        Index("ix_call_logs_external_call_id_status", "external_call_id", "status"),
+        # Serves both "logs of this reminder" and "its latest log" lookups
+        Index("ix_call_logs_reminder_received", "reminder_id", "received_at"),
+        UniqueConstraint("external_call_id", "status", name="uq_call_logs_ecid_status"),
     )
@@ -1,11 +1,10 @@
 """Reminder model - copied from backend-api for consistency."""
-import uuid
-from datetime import datetime
 from enum import Enum as PyEnum
-from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Enum, Index
+from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Enum, Index, func, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.database import Base
+from app.ids import uuid7
 
 
 class ReminderStatus(str, PyEnum):
@@ -22,25 +21,32 @@ class ReminderStatus(str, PyEnum):
 class Reminder(Base):
     """Reminder model representing a voice reminder."""
     __tablename__ = "reminders"
+    # Fetch server-generated ids/timestamps via RETURNING instead of expiring them
+    __mapper_args__ = {"eager_defaults": True}
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7, server_default=text("gen_random_uuid()"))
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     phone_number = Column(String(20), nullable=False)
     message = Column(Text, nullable=False)
-    scheduled_at = Column(DateTime, nullable=False, index=True)
+    scheduled_at = Column(DateTime, nullable=False)
     status = Column(
         Enum(ReminderStatus, name="reminder_status", create_type=False, values_callable=lambda x: [e.value for e in x]),
         default=ReminderStatus.SCHEDULED,
         nullable=False
     )
     external_call_id = Column(String(255), nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, server_default=func.timezone("utc", func.now()), nullable=False)
+    updated_at = Column(DateTime, server_default=func.timezone("utc", func.now()), onupdate=func.timezone("utc", func.now()), nullable=False)
     
     user = relationship("User", back_populates="reminders")
     call_logs = relationship("CallLog", back_populates="reminder", cascade="all, delete-orphan")
     
     __table_args__ = (
-        Index("ix_reminders_user_id", "user_id"),
-        Index("ix_reminders_status_scheduled_at", "status", "scheduled_at"),
+        # (scheduled_at, id) DESC back keyset pagination of the reminder lists
+        Index("ix_reminders_scheduled_at_id", scheduled_at.desc(), id.desc()),
+        Index("ix_reminders_user_id_scheduled_at_id", "user_id", scheduled_at.desc(), id.desc()),
+        # Partial indexes cover only live rows, so called/failed history never
+        # bloats the due-reminder scan or the stuck-processing sweep
+        Index("ix_reminders_due", "scheduled_at", postgresql_where=text("status = 'scheduled'")),
+        Index("ix_reminders_processing", "scheduled_at", postgresql_where=text("status = 'processing'")),
     )
@@ -0,0 +1,24 @@
+"""
+Scheduler control endpoints.
+
+Lets the backend API wake the scheduler as soon as a reminder is created,
+instead of waiting for the current sleep to run out.
+"""
+import logging
+from fastapi import APIRouter, status
+from app.scheduler.reminder_scheduler import wake_scheduler
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/scheduler", tags=["Scheduler"])
+
+
+@router.post("/wake", status_code=status.HTTP_202_ACCEPTED)
+async def wake():
+    """
+    Wake the scheduler to re-check due reminders now.
+    
+    Returns 202 Accepted; the scheduler runs on its own task.
+    """
+    logger.debug("POST /scheduler/wake")
+    wake_scheduler()
+    return {"status": "accepted"}
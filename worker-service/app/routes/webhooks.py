@@ -4,17 +4,36 @@ Webhook endpoints for receiving voice provider callbacks.
 Handles call status updates with idempotency checks.
 """
 import logging
+import orjson
 from uuid import UUID
-from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, status, Request
-from pydantic import BaseModel
-from sqlalchemy.orm import Session
-from app.database import get_db
+from fastapi import APIRouter, BackgroundTasks, HTTPException, status, Request
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy import case, literal, select, update
+from sqlalchemy.dialects.postgresql import insert
+from app.database import get_db_session
 from app.models.reminder import Reminder, ReminderStatus
 from app.models.call_log import CallLog
 
 logger = logging.getLogger(__name__)
-router = APIRouter(prefix="/webhooks", tags=["Webhooks"])
+# Handlers return ORJSONResponse directly so FastAPI skips its jsonable_encoder pass
+router = APIRouter(prefix="/webhooks", tags=["Webhooks"], default_response_class=ORJSONResponse)
+
+# Delivery reports are a few KB even for batches; anything far larger is refused unread
+MAX_WEBHOOK_BYTES = 1024 * 1024
+
+# Infobip status group -> reminder status; any other group
+# (UNDELIVERABLE, EXPIRED, REJECTED, ...) marks the reminder failed
+_INFOBIP_GROUP_STATUS = {
+    "DELIVERED": ReminderStatus.CALLED,
+    "PENDING": ReminderStatus.PROCESSING,
+}
+
+# Generic provider call status -> reminder status; anything else is a failure
+_GENERIC_CALL_STATUS = {
+    "completed": ReminderStatus.CALLED,
+    "ended": ReminderStatus.CALLED,
+}
 
 
 class WebhookMetadata(BaseModel):
@@ -45,231 +64,274 @@ class InfobipResult(BaseModel):
     price: dict | None = None
     status: dict
     error: dict | None = None
+    callbackData: str | None = None
+
 
+# Validates a whole results[] array in one call
+_INFOBIP_RESULTS = TypeAdapter(list[InfobipResult])
 
-class InfobipWebhook(BaseModel):
+
+async def _read_body(request: Request, limit: int) -> bytes:
     """
-    Infobip webhook payload structure.
+    Read the request body, refusing bodies larger than limit.
+    
+    Chunks are joined once at the end, and orjson parses the resulting
+    bytes directly without decoding them to str first.
     
-    Infobip sends delivery reports with this format.
+    Args:
+        request: Incoming request
+        limit: Maximum body size in bytes
+        
+    Returns:
+        The request body
+        
+    Raises:
+        HTTPException: 413 if Content-Length or the bytes received exceed limit
     """
-    results: list[InfobipResult]
-    customData: dict | None = None
+    content_length = request.headers.get("content-length")
+    if content_length is not None and content_length.isdigit() and int(content_length) > limit:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Webhook body exceeds {limit} bytes"
+        )
+    
+    chunks = []
+    size = 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > limit:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Webhook body exceeds {limit} bytes"
+            )
+        chunks.append(chunk)
+    return b"".join(chunks)
 
 
 @router.post("/call-status", status_code=status.HTTP_200_OK)
 async def handle_call_status(
     request: Request,
-    db: Session = Depends(get_db)
+    background_tasks: BackgroundTasks
 ):
     """
     Handle call status webhook from Infobip.
     
     This endpoint:
     1. Validates the webhook payload (supports both Infobip and generic formats)
-    2. Checks for idempotency (duplicate webhooks)
-    3. Updates reminder status to 'called' or 'failed'
-    4. Stores call info in call_logs
+    2. Acknowledges it with 200 OK straight away
+    3. In a background task, checks for idempotency (duplicate webhooks),
+       updates the reminder status and stores call info in call_logs
+    
+    Infobip delivery reports look like {"results": [...], "customData": {...}}
+    and may batch several messages; every result is validated and applied.
     
-    Returns 200 OK on success, even for duplicates (idempotent).
+    Malformed payloads and reminder ids are still rejected with 400 before
+    the acknowledgement, so the provider sees them; unknown reminders and
+    duplicates are only logged by the background task.
     """
-    # Get raw body for logging
-    body = await request.json()
-    logger.info(f"Webhook received: {body}")
+    raw_body = await _read_body(request, MAX_WEBHOOK_BYTES)
     
-    # Try to parse as Infobip format first
+    # Only parsing is guarded here; HTTPExceptions from validation must reach
+    # the client unchanged
     try:
+        body = orjson.loads(raw_body)
+        # The full report can be large and carries recipients' phone numbers;
+        # INFO gets a per-format summary below instead
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Webhook received: %s", body)
+        
         if "results" in body:
             # Infobip format
-            webhook = InfobipWebhook(**body)
-            return await _process_infobip_webhook(webhook, db)
+            results = _INFOBIP_RESULTS.validate_python(body["results"])
+            custom_data = body.get("customData")
+            if custom_data is not None and not isinstance(custom_data, dict):
+                raise ValueError("customData must be an object")
+            webhook = None
         else:
             # Generic format (backward compatibility)
-            webhook = CallStatusWebhook(**body)
-            return await _process_generic_webhook(webhook, db)
+            webhook = CallStatusWebhook.model_validate(body)
     except Exception as e:
-        logger.error(f"Error parsing webhook: {str(e)}", exc_info=True)
+        logger.error("Error parsing webhook: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Invalid webhook format: {str(e)}"
         )
+    
+    if webhook is None:
+        return _accept_infobip_webhook(results, custom_data, background_tasks)
+    return _accept_generic_webhook(webhook, background_tasks)
 
 
-async def _process_infobip_webhook(
-    payload: InfobipWebhook,
-    db: Session
-):
-    """Process Infobip-specific webhook format."""
-    if not payload.results:
-        logger.warning("No results in Infobip webhook")
-        return {"message": "No results to process"}
-    
-    result = payload.results[0]  # Process first result
-    call_id = result.messageId
-    status_info = result.status
-    status_name = status_info.get("name", "UNKNOWN")
-    status_group = status_info.get("groupName", "UNKNOWN")
-    
-    logger.info(
-        f"Infobip webhook: messageId={call_id}, status={status_name}, group={status_group}"
-    )
-    
-    # Extract reminder_id from customData
-    if not payload.customData or "reminder_id" not in payload.customData:
-        logger.warning("No reminder_id in customData")
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Missing reminder_id in customData"
-        )
+def _parse_reminder_id(value: str) -> UUID:
+    """
+    Parse a reminder id from a webhook payload.
     
+    Raises:
+        HTTPException: 400 if the id is not a valid UUID
+    """
     try:
-        reminder_id = UUID(payload.customData["reminder_id"])
-    except ValueError:
-        logger.warning(f"Invalid reminder_id format: {payload.customData['reminder_id']}")
+        return UUID(value)
+    except (TypeError, ValueError, AttributeError):
+        logger.warning("Invalid reminder_id format: %s", value)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid reminder_id format"
         )
+
+
+def _accept_infobip_webhook(
+    results: list[InfobipResult],
+    custom_data: dict | None,
+    background_tasks: BackgroundTasks
+) -> ORJSONResponse:
+    """
+    Validate an Infobip report and queue the status updates of all its results.
     
-    # Find the reminder
-    reminder = db.query(Reminder).filter(Reminder.id == reminder_id).first()
-    
-    if not reminder:
-        logger.warning(f"Reminder not found: {reminder_id}")
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Reminder {reminder_id} not found"
-        )
+    Each result is matched to its reminder by its callbackData (set to the
+    reminder id when the message is sent), falling back to the report's
+    customData.reminder_id.
+    """
+    if not results:
+        logger.warning("No results in Infobip webhook")
+        return ORJSONResponse({"message": "No results to process"})
     
-    # Idempotency check
-    existing_log = (
-        db.query(CallLog)
-        .filter(
-            CallLog.external_call_id == call_id,
-            CallLog.status == status_name
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(
+            "Infobip webhook received: %s result(s), messageIds=%s",
+            len(results), [result.messageId for result in results]
         )
-        .first()
-    )
     
-    if existing_log:
-        logger.info(f"Duplicate webhook - already processed: {call_id}")
-        return {"message": "Webhook already processed", "idempotent": True}
+    default_reminder_id = custom_data.get("reminder_id") if custom_data else None
+    updates = []
     
-    # Map Infobip status to reminder status
-    # Infobip groups: PENDING, UNDELIVERABLE, DELIVERED, EXPIRED, REJECTED
-    if status_group in ["DELIVERED"]:
-        new_status = ReminderStatus.CALLED
-    elif status_group in ["PENDING"]:
-        new_status = ReminderStatus.PROCESSING
-    else:
-        new_status = ReminderStatus.FAILED
-    
-    # Update reminder status
-    reminder.status = new_status
+    for result in results:
+        call_id = result.messageId
+        status_info = result.status
+        status_name = status_info.get("name", "UNKNOWN")
+        status_group = status_info.get("groupName", "UNKNOWN")
+        
+        logger.debug(
+            "Infobip webhook: messageId=%s, status=%s, group=%s", call_id, status_name, status_group
+        )
+        
+        raw_reminder_id = result.callbackData or default_reminder_id
+        if not raw_reminder_id:
+            logger.warning("No reminder_id in callbackData or customData: %s", call_id)
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Missing reminder_id in customData"
+            )
+        
+        # Map Infobip status to reminder status
+        # Infobip groups: PENDING, UNDELIVERABLE, DELIVERED, EXPIRED, REJECTED
+        updates.append(({
+            "reminder_id": _parse_reminder_id(raw_reminder_id),
+            "external_call_id": call_id,
+            "status": status_name,
+            "transcript": (
+                f"Status: {status_name}, Group: {status_group}, Duration: {result.duration}s"
+                if result.duration else f"Status: {status_name}"
+            )
+        }, _INFOBIP_GROUP_STATUS.get(status_group, ReminderStatus.FAILED)))
     
-    # Create call log entry
-    call_log = CallLog(
-        reminder_id=reminder_id,
-        external_call_id=call_id,
-        status=status_name,
-        transcript=f"Status: {status_name}, Group: {status_group}, Duration: {result.duration}s" if result.duration else f"Status: {status_name}",
-        received_at=datetime.utcnow()
-    )
-    db.add(call_log)
+    background_tasks.add_task(_record_call_statuses, updates)
     
-    try:
-        db.commit()
-        logger.info(
-            f"Infobip webhook processed: reminder {reminder_id} -> {new_status.value}"
-        )
-        return {
-            "message": "Webhook processed successfully",
-            "reminder_id": str(reminder_id),
-            "new_status": new_status.value
-        }
-    except Exception as e:
-        db.rollback()
-        logger.error(f"Error processing webhook: {str(e)}", exc_info=True)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Error processing webhook"
-        )
+    return ORJSONResponse({"message": "Webhook accepted", "accepted": len(updates)})
 
 
-async def _process_generic_webhook(
+def _accept_generic_webhook(
     payload: CallStatusWebhook,
-    db: Session
-):
-    """Process generic webhook format (backward compatibility)."""
+    background_tasks: BackgroundTasks
+) -> ORJSONResponse:
+    """Validate a generic webhook (backward compatibility) and queue its status update."""
     logger.info(
-        f"Generic webhook: call_id={payload.call_id}, status={payload.status}"
+        "Generic webhook: call_id=%s, status=%s", payload.call_id, payload.status
     )
     
-    try:
-        reminder_id = UUID(payload.metadata.reminder_id)
-    except ValueError:
-        logger.warning(f"Invalid reminder_id format: {payload.metadata.reminder_id}")
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid reminder_id format"
-        )
-    
-    reminder = db.query(Reminder).filter(Reminder.id == reminder_id).first()
-    
-    if not reminder:
-        logger.warning(f"Reminder not found: {reminder_id}")
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Reminder {reminder_id} not found"
-        )
-    
-    existing_log = (
-        db.query(CallLog)
-        .filter(
-            CallLog.external_call_id == payload.call_id,
-            CallLog.status == payload.status
-        )
-        .first()
-    )
+    reminder_id = _parse_reminder_id(payload.metadata.reminder_id)
+    new_status = _GENERIC_CALL_STATUS.get(payload.status, ReminderStatus.FAILED)
     
-    if existing_log:
-        logger.info(f"Duplicate webhook - already processed: {payload.call_id}")
-        return {"message": "Webhook already processed", "idempotent": True}
+    background_tasks.add_task(_record_call_statuses, [({
+        "reminder_id": reminder_id,
+        "external_call_id": payload.call_id,
+        "status": payload.status,
+        "transcript": payload.transcript
+    }, new_status)])
     
-    if payload.status in ["completed", "ended"]:
-        new_status = ReminderStatus.CALLED
-    else:
-        new_status = ReminderStatus.FAILED
+    return ORJSONResponse({
+        "message": "Webhook accepted",
+        "reminder_id": str(reminder_id),
+        "new_status": new_status.value
+    })
+
+
+async def _record_call_statuses(updates: list[tuple[dict, ReminderStatus]]) -> None:
+    """
+    Apply acknowledged webhook results in one transaction.
     
-    reminder.status = new_status
+    One SELECT finds which reminders exist, one multi-row INSERT ... ON
+    CONFLICT DO NOTHING adds the call logs (the (external_call_id, status)
+    unique constraint makes duplicates no-ops), and one CASE UPDATE sets the
+    status of every reminder whose log was new - the last result wins when
+    a report carries several for the same reminder.
     
-    call_log = CallLog(
-        reminder_id=reminder_id,
-        external_call_id=payload.call_id,
-        status=payload.status,
-        transcript=payload.transcript,
-        received_at=datetime.utcnow()
-    )
-    db.add(call_log)
+    Runs after the response has been sent, in its own session. Errors can no
+    longer reach the provider, so they are logged instead of raised.
     
+    Args:
+        updates: (call log row, new reminder status) for each result, in
+            report order
+    """
     try:
-        db.commit()
-        logger.info(f"Generic webhook processed: reminder {reminder_id} -> {new_status.value}")
-        return {
-            "message": "Webhook processed successfully",
-            "reminder_id": str(reminder_id),
-            "new_status": new_status.value
-        }
+        async with get_db_session() as db:
+            requested_ids = {row["reminder_id"] for row, _ in updates}
+            known_ids = set((await db.scalars(
+                select(Reminder.id).where(Reminder.id.in_(requested_ids))
+            )).all())
+            
+            for reminder_id in requested_ids - known_ids:
+                logger.warning("Reminder not found: %s", reminder_id)
+            
+            log_rows = [row for row, _ in updates if row["reminder_id"] in known_ids]
+            if not log_rows:
+                return
+            
+            inserted = set((await db.execute(
+                insert(CallLog)
+                .values(log_rows)
+                .on_conflict_do_nothing(constraint="uq_call_logs_ecid_status")
+                .returning(CallLog.external_call_id, CallLog.status)
+            )).tuples().all())
+            
+            new_statuses = {}
+            for row, new_status in updates:
+                if (row["external_call_id"], row["status"]) in inserted:
+                    new_statuses[row["reminder_id"]] = new_status
+                elif row["reminder_id"] in known_ids:
+                    logger.info("Duplicate webhook - already processed: %s", row["external_call_id"])
+            
+            if new_statuses:
+                await db.execute(
+                    update(Reminder)
+                    .where(Reminder.id.in_(new_statuses))
+                    .values(status=case(
+                        {
+                            reminder_id: literal(new_status, Reminder.status.type)
+                            for reminder_id, new_status in new_statuses.items()
+                        },
+                        value=Reminder.id,
+                        else_=Reminder.status
+                    ))
+                )
+            await db.commit()
+        
+        for reminder_id, new_status in new_statuses.items():
+            logger.info("Webhook processed: reminder %s -> %s", reminder_id, new_status.value)
     except Exception as e:
-        db.rollback()
-        logger.error(f"Error processing webhook: {str(e)}", exc_info=True)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Error processing webhook"
-        )
+        logger.error("Error processing webhook for %s result(s): %s", len(updates), e, exc_info=True)
 
 
 @router.get("/health")
 async def webhook_health():
     """Health check for webhook endpoint."""
-    return {"status": "healthy", "service": "webhook"}
+    return ORJSONResponse({"status": "healthy", "service": "webhook"})
@@ -1,236 +1,405 @@
 """
 Reminder Scheduler - processes due reminders.
 
-Uses APScheduler to periodically check for and process due reminders.
+Runs as an asyncio task that sleeps until the next reminder is due (bounded
+by SCHEDULER_INTERVAL_SECONDS) and can be woken early when one is created.
 """
-import logging
 import asyncio
-from datetime import datetime, timezone, timedelta
-from sqlalchemy.orm import Session
-from app.database import get_db_session
+import logging
+import random
+import time
+from datetime import datetime
+from sqlalchemy import select, update, insert, case, literal, func, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.database import get_db_session, pipeline
 from app.models.reminder import Reminder, ReminderStatus
 from app.models.call_log import CallLog
-from app.integrations.voice_provider import voice_provider
+from app.integrations.voice_provider import CallResponse, get_voice_provider, MAX_KEEPALIVE_CONNECTIONS
 
 logger = logging.getLogger(__name__)
 
-# Pakistan Standard Time (PKT) is UTC+5
-PKT = timezone(timedelta(hours=5))
-
 # Maximum reminders to process per batch
 MAX_BATCH_SIZE = 50
 
 # Maximum retry attempts for failed calls
 MAX_RETRIES = 3
 
+# Shortest sleep between ticks, so an overdue backlog doesn't spin the loop
+MIN_POLL_SECONDS = 0.2
+
+# Random delay added to each timed sleep so worker replicas waiting on the
+# same reminder don't all wake and race for it at once
+JITTER_SECONDS = 0.2
+
+# Set to end the current sleep early; created by run_scheduler_loop
+_wake_event: asyncio.Event | None = None
+
+
+# Atomically move a batch of due reminders to 'processing' and return them.
+# SKIP LOCKED lets several worker replicas claim disjoint batches; the inner
+# scan is the partial index ix_reminders_due.
+_CLAIM_DUE = text("""
+    UPDATE reminders
+    SET status = 'processing', updated_at = timezone('utc', now())
+    WHERE id IN (
+        SELECT id FROM reminders
+        WHERE status = 'scheduled' AND scheduled_at <= timezone('utc', now())
+        ORDER BY scheduled_at
+        LIMIT :limit
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING id, phone_number, message
+""")
+
+
+async def claim_due_reminders(db: AsyncSession, limit: int = MAX_BATCH_SIZE) -> list[dict]:
+    """
+    Claim due reminders in one round-trip.
+    
+    Due means scheduled at or before the database's own clock, read as
+    naive UTC like every stored timestamp.
+    
+    Args:
+        db: Database session
+        limit: Maximum reminders to claim
+        
+    Returns:
+        Claimed reminders as dicts with id, phone_number and message, already
+        committed as 'processing'
+    """
+    rows = (await db.execute(_CLAIM_DUE, {"limit": limit})).mappings().all()
+    await db.commit()
+    return [dict(row) for row in rows]
+
 
 async def process_due_reminders():
     """
     Main scheduler job - finds and processes all due reminders.
     
     This function:
-    1. Queries for reminders where scheduled_at <= now and status = 'scheduled'
-    2. For each reminder, updates status to 'processing'
-    3. Calls voice provider API
-    4. Stores call_id and creates call log
-    5. Handles errors with logging
+    1. Claims reminders where scheduled_at <= now and status = 'scheduled',
+       moving them to 'processing' in a single UPDATE ... RETURNING
+    2. Calls voice provider API for each, concurrently
+    3. Stores call_ids, failures and call logs for the batch in one commit
+    4. Handles errors with logging
     """
-    # Get current time in PKT (Pakistan Standard Time)
-    current_time_pkt = datetime.now(PKT)
-    current_time_naive = current_time_pkt.replace(tzinfo=None)
-    
-    logger.info(f"Scheduler: Checking for due reminders... (Current PKT: {current_time_pkt.strftime('%Y-%m-%d %H:%M:%S')})")
-    
-    db = get_db_session()
     try:
-        # Find due reminders (compare timezone-naive datetimes)
-        due_reminders = (
-            db.query(Reminder)
-            .filter(
-                Reminder.status == ReminderStatus.SCHEDULED,
-                Reminder.scheduled_at <= current_time_naive
-            )
-            .order_by(Reminder.scheduled_at.asc())
-            .limit(MAX_BATCH_SIZE)
-            .all()
-        )
-        
-        # Log all scheduled reminders for debugging
-        all_scheduled = db.query(Reminder).filter(Reminder.status == ReminderStatus.SCHEDULED).all()
-        if all_scheduled:
-            logger.info(f"Found {len(all_scheduled)} scheduled reminders in DB:")
-            for r in all_scheduled[:5]:  # Show first 5
-                is_due = r.scheduled_at <= current_time_naive
-                logger.info(f"  - Scheduled: {r.scheduled_at}, Due: {is_due}, Message: {r.message[:30]}...")
+        async with get_db_session() as db:
+            # Log the next few scheduled reminders for debugging - a LIMITed
+            # read of the ix_reminders_due index, skipped entirely unless DEBUG.
+            # scheduled_at is stored as naive UTC, so compare against naive UTC
+            if logger.isEnabledFor(logging.DEBUG):
+                now = datetime.utcnow()
+                logger.debug("Scheduler: Checking for due reminders... (Current UTC: %s)", now)
+                upcoming = (await db.execute(
+                    select(Reminder.scheduled_at, Reminder.message)
+                    .where(Reminder.status == ReminderStatus.SCHEDULED)
+                    .order_by(Reminder.scheduled_at)
+                    .limit(5)
+                )).all()
+                for scheduled_at, message in upcoming:
+                    is_due = scheduled_at <= now
+                    logger.debug("  - Scheduled: %s, Due: %s, Message: %s...", scheduled_at, is_due, message[:30])
+            
+            # Claim due reminders against the database clock
+            due_reminders = await claim_due_reminders(db)
         
         if not due_reminders:
             logger.debug("No due reminders found")
             return
         
-        logger.info(f"Found {len(due_reminders)} due reminder(s) to process")
+        logger.info("Claimed %s due reminder(s) to process", len(due_reminders))
+        started = time.monotonic()
+        
+        # Call the whole batch concurrently; provider calls are bounded by the
+        # HTTP client's keep-alive pool so it is never oversubscribed
+        call_slots = asyncio.Semaphore(MAX_KEEPALIVE_CONNECTIONS)
+        results = await asyncio.gather(
+            *(_create_call(reminder, call_slots) for reminder in due_reminders),
+            return_exceptions=True
+        )
+        
+        # Then record every outcome in a single transaction
+        created = await record_call_results(due_reminders, results)
+        logger.info("Dispatched %s reminder(s) in %.3fs", len(due_reminders), time.monotonic() - started)
         
-        # Process each reminder
-        for reminder in due_reminders:
-            await process_single_reminder(db, reminder)
+        # If in mock mode, simulate completion of each created call
+        if created and get_voice_provider().mock_mode:
+            await asyncio.gather(
+                *(_simulate_mock_completion(reminder, call_id) for reminder, call_id in created),
+                return_exceptions=True
+            )
             
     except Exception as e:
-        logger.error(f"Scheduler error: {str(e)}", exc_info=True)
-    finally:
-        db.close()
+        logger.error("Scheduler error: %s", e, exc_info=True)
+
 
+async def _set_status(db: AsyncSession, reminder_id, status: ReminderStatus, **values) -> None:
+    """Stage a status change (plus any other column values) for one reminder."""
+    await db.execute(
+        update(Reminder)
+        .where(Reminder.id == reminder_id)
+        .values(status=status, **values)
+    )
 
-async def process_single_reminder(db: Session, reminder: Reminder):
+
+async def _add_call_log(db: AsyncSession, reminder_id, external_call_id: str, status: str, transcript: str | None = None) -> None:
+    """Stage a call log insert; Core rather than ORM so it can be pipelined."""
+    await db.execute(
+        insert(CallLog)
+        .values(
+            reminder_id=reminder_id,
+            external_call_id=external_call_id,
+            status=status,
+            transcript=transcript
+        )
+    )
+
+
+async def _create_call(reminder: dict, call_slots: asyncio.Semaphore) -> CallResponse:
     """
-    Process a single reminder - trigger voice call.
+    Trigger the voice call for one claimed reminder.
     
     Args:
-        db: Database session
-        reminder: Reminder to process
+        reminder: Claimed reminder (id, phone_number, message), already 'processing'
+        call_slots: Bounds concurrent voice provider calls
+        
+    Returns:
+        The provider's response
     """
-    reminder_id = str(reminder.id)
+    reminder_id = str(reminder["id"])
+    logger.info("Processing reminder %s", reminder_id)
     
-    try:
-        logger.info(f"Processing reminder {reminder_id}")
-        
-        # Lock the reminder by setting status to processing
-        reminder.status = ReminderStatus.PROCESSING
-        db.commit()
-        
-        logger.info(f"Reminder {reminder_id} status updated to PROCESSING")
-        
-        # Call voice provider (real or mock)
-        response = await voice_provider.create_call(
-            phone_number=reminder.phone_number,
-            message=reminder.message,
+    # Call voice provider (real or mock)
+    async with call_slots:
+        return await get_voice_provider().create_call(
+            phone_number=reminder["phone_number"],
+            message=reminder["message"],
             reminder_id=reminder_id
         )
+
+
+async def record_call_results(claimed: list[dict], results: list) -> list[tuple[dict, str]]:
+    """
+    Store the outcome of a batch of provider calls in one UPDATE and one
+    multi-row call log INSERT, committed together.
+    
+    Successful calls get their external call ID and a 'created' log; failed
+    calls (provider error or exception) are marked 'failed'. If the write
+    itself fails, the reminder UPDATE is retried on its own in a fresh
+    session: only the failed calls are marked 'failed', and reminders whose
+    message was already sent stay 'processing' with their external call ID,
+    so later delivery webhooks still apply to them.
+    
+    Args:
+        claimed: Reminders claimed for this batch
+        results: CallResponse or exception for each claimed reminder, in order
         
-        if response.success:
-            # Store external call ID
-            reminder.external_call_id = response.call_id
-            db.commit()
-            
-            # Create initial call log entry
-            call_log = CallLog(
-                reminder_id=reminder.id,
-                external_call_id=response.call_id,
-                status="created"
-            )
-            db.add(call_log)
-            db.commit()
-            
-            logger.info(
-                f"Call created for reminder {reminder_id}: call_id={response.call_id}",
-                extra={
-                    "reminder_id": reminder_id,
-                    "call_id": response.call_id,
-                    "phone_number": reminder.phone_number
-                }
+    Returns:
+        (reminder, call_id) for every call that was created, whether or not
+        the write succeeded - those messages have been sent either way
+    """
+    created: list[tuple[dict, str]] = []
+    failed_ids = []
+    log_rows = []
+    
+    for reminder, result in zip(claimed, results):
+        reminder_id = str(reminder["id"])
+        
+        if isinstance(result, BaseException):
+            logger.error(
+                "Error processing reminder %s: %s", reminder_id, result,
+                exc_info=(type(result), result, result.__traceback__)
             )
+            failed_ids.append(reminder["id"])
+        elif result.success:
+            created.append((reminder, result.call_id))
+            log_rows.append({
+                "reminder_id": reminder["id"],
+                "external_call_id": result.call_id,
+                "status": "created",
+                "transcript": None
+            })
             
-            # If in mock mode, simulate immediate completion
-            if voice_provider.mock_mode:
-                await _simulate_mock_completion(db, reminder)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "Call created for reminder %s: call_id=%s", reminder_id, result.call_id,
+                    extra={
+                        "reminder_id": reminder_id,
+                        "call_id": result.call_id,
+                        "phone_number": reminder["phone_number"]
+                    }
+                )
         else:
-            # Call failed
             logger.error(
-                f"Failed to create call for reminder {reminder_id}: {response.error_message}"
+                "Failed to create call for reminder %s: %s", reminder_id, result.error_message
             )
-            
-            # Mark as failed
-            reminder.status = ReminderStatus.FAILED
-            db.commit()
-            
-            # Create failure call log
-            call_log = CallLog(
-                reminder_id=reminder.id,
-                external_call_id=response.call_id or "failed-to-create",
-                status="failed",
-                transcript=f"Error: {response.error_message}"
+            failed_ids.append(reminder["id"])
+            log_rows.append({
+                "reminder_id": reminder["id"],
+                "external_call_id": result.call_id or f"failed-to-create-{reminder_id}",
+                "status": "failed",
+                "transcript": f"Error: {result.error_message}"
+            })
+    
+    # One UPDATE for the whole batch: failures flip status, successes get
+    # their external call ID, keyed on the reminder id
+    claimed_ids = [reminder["id"] for reminder in claimed]
+    values = {}
+    if failed_ids:
+        values["status"] = case(
+            (Reminder.id.in_(failed_ids), literal(ReminderStatus.FAILED, Reminder.status.type)),
+            else_=Reminder.status
+        )
+    if created:
+        values["external_call_id"] = case(
+            {reminder["id"]: call_id for reminder, call_id in created},
+            value=Reminder.id,
+            else_=Reminder.external_call_id
+        )
+    
+    try:
+        async with get_db_session() as db, pipeline(db):
+            await db.execute(
+                update(Reminder).where(Reminder.id.in_(claimed_ids)).values(**values)
             )
-            db.add(call_log)
-            db.commit()
-            
+            if log_rows:
+                await db.execute(insert(CallLog), log_rows)
+            await db.commit()
     except Exception as e:
-        logger.error(f"Error processing reminder {reminder_id}: {str(e)}", exc_info=True)
+        logger.error("Error recording call results for %s reminder(s): %s", len(claimed), e, exc_info=True)
         
         try:
-            # Mark as failed on exception
-            reminder.status = ReminderStatus.FAILED
-            db.commit()
-        except:
-            db.rollback()
+            # Retry just the status/call ID update, without the call logs, in
+            # a fresh session - never fail a reminder whose message went out
+            async with get_db_session() as db:
+                await db.execute(
+                    update(Reminder).where(Reminder.id.in_(claimed_ids)).values(**values)
+                )
+                await db.commit()
+        except Exception:
+            logger.error("Could not record call results for %s reminder(s)", len(claimed), exc_info=True)
+    
+    return created
 
 
-async def _simulate_mock_completion(db: Session, reminder: Reminder):
+async def _simulate_mock_completion(reminder: dict, call_id: str):
     """
     Simulate call completion for mock mode.
     
     Waits a few seconds then marks the call as completed with a mock transcript.
     """
-    import asyncio
-    import random
-    
     # Simulate call duration (2-5 seconds)
     await asyncio.sleep(random.uniform(2, 5))
     
     try:
-        # Refresh reminder from DB
-        db.refresh(reminder)
-        
         # Simulate success (90% of the time)
         is_success = random.random() < 0.95
         
         if is_success:
-            # Mark as called
-            reminder.status = ReminderStatus.CALLED
-            
-            # Create completion call log with mock transcript
-            call_log = CallLog(
-                reminder_id=reminder.id,
-                external_call_id=reminder.external_call_id,
-                status="completed",
-                transcript=f"[MOCK TRANSCRIPT] Your reminder: {reminder.message}. Call duration: {random.randint(10, 30)} seconds."
-            )
-            db.add(call_log)
-            db.commit()
+            # Mark as called, with a completion call log and mock transcript
+            async with get_db_session() as db, pipeline(db):
+                await _set_status(db, reminder["id"], ReminderStatus.CALLED)
+                await _add_call_log(
+                    db,
+                    reminder["id"],
+                    call_id,
+                    "completed",
+                    transcript=f"[MOCK TRANSCRIPT] Your reminder: {reminder['message']}. Call duration: {random.randint(10, 30)} seconds."
+                )
+                await db.commit()
             
-            logger.info(
-                f"🎭 [MOCK] Call completed for reminder {reminder.id}",
-                extra={
-                    "reminder_id": str(reminder.id),
-                    "status": "completed"
-                }
-            )
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "🎭 [MOCK] Call completed for reminder %s", reminder['id'],
+                    extra={
+                        "reminder_id": str(reminder["id"]),
+                        "status": "completed"
+                    }
+                )
         else:
             # Simulate failure
-            reminder.status = ReminderStatus.FAILED
-            
-            call_log = CallLog(
-                reminder_id=reminder.id,
-                external_call_id=reminder.external_call_id,
-                status="failed",
-                transcript="[MOCK] Call failed - no answer"
-            )
-            db.add(call_log)
-            db.commit()
+            async with get_db_session() as db, pipeline(db):
+                await _set_status(db, reminder["id"], ReminderStatus.FAILED)
+                await _add_call_log(db, reminder["id"], call_id, "failed", transcript="[MOCK] Call failed - no answer")
+                await db.commit()
             
-            logger.warning(
-                f"🎭 [MOCK] Call failed for reminder {reminder.id}",
-                extra={
-                    "reminder_id": str(reminder.id),
-                    "status": "failed"
-                }
-            )
+            if logger.isEnabledFor(logging.WARNING):
+                logger.warning(
+                    "🎭 [MOCK] Call failed for reminder %s", reminder['id'],
+                    extra={
+                        "reminder_id": str(reminder["id"]),
+                        "status": "failed"
+                    }
+                )
             
     except Exception as e:
-        logger.error(f"Error simulating mock completion: {str(e)}", exc_info=True)
-        db.rollback()
+        logger.error("Error simulating mock completion: %s", e, exc_info=True)
 
 
-def run_scheduler_sync():
+async def next_due_at() -> datetime | None:
+    """
+    Get the earliest scheduled_at among reminders still waiting to be sent.
+    
+    Returns:
+        scheduled_at of the next reminder, or None if nothing is scheduled
     """
-    Synchronous wrapper for the async scheduler job.
-    Called by APScheduler.
+    async with get_db_session() as db:
+        return await db.scalar(
+            select(func.min(Reminder.scheduled_at))
+            .where(Reminder.status == ReminderStatus.SCHEDULED)
+        )
+
+
+async def run_scheduler_loop():
+    """
+    Process due reminders, then sleep until the next one is due.
+    
+    The sleep is clamped to [MIN_POLL_SECONDS, SCHEDULER_INTERVAL_SECONDS]
+    and then lengthened by up to JITTER_SECONDS (never shortened, so it does
+    not fire before the reminder is due). It ends early when wake_scheduler()
+    is called, but ticks still start at least MIN_POLL_SECONDS apart: wakes
+    arriving within that floor (e.g. a burst of reminder creates) are merged
+    into the next tick. Runs until cancelled.
     """
-    asyncio.run(process_due_reminders())
+    global _wake_event
+    _wake_event = asyncio.Event()
+    max_delay = settings.SCHEDULER_INTERVAL_SECONDS
+    
+    while True:
+        tick_started = time.monotonic()
+        await process_due_reminders()
+        
+        try:
+            next_due = await next_due_at()
+        except Exception as e:
+            logger.error("Scheduler error reading next due time: %s", e, exc_info=True)
+            next_due = None
+        
+        if next_due is None:
+            delay = max_delay
+        else:
+            # scheduled_at is naive UTC. The claim reads the database clock,
+            # so skew here only shifts the wake-up, bounded by MIN_POLL_SECONDS
+            now = datetime.utcnow()
+            delay = min(max((next_due - now).total_seconds(), MIN_POLL_SECONDS), max_delay)
+        delay += random.uniform(0, JITTER_SECONDS)
+        
+        logger.debug("Scheduler sleeping %.1fs", delay)
+        try:
+            await asyncio.wait_for(_wake_event.wait(), timeout=delay)
+        except asyncio.TimeoutError:
+            pass
+        else:
+            # Woken early - hold the floor; wakes during it merge into this one
+            remaining = MIN_POLL_SECONDS - (time.monotonic() - tick_started)
+            if remaining > 0:
+                await asyncio.sleep(remaining)
+        _wake_event.clear()
+
+
+def wake_scheduler():
+    """Cut the scheduler's current sleep short, e.g. after a reminder is created."""
+    if _wake_event is not None:
+        _wake_event.set()